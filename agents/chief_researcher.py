@@ -22,7 +22,7 @@ class ChiefResearcherAgent(BaseAgent):
     """Chief Researcher agent that creates the initial research plan."""
 
     async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
-        from ..tools.toolset_registry import toolset_registry
+        from ..tools.toolset_registry import get_toolset_registry
         from ..prompts.builder import inject_template_variables_with_context_preloading
         
         domi_state = get_domi_state(ctx)
@@ -33,7 +33,7 @@ class ChiefResearcherAgent(BaseAgent):
         plan_path = os.path.join(planning_dir, plan_artifact_name)
 
         # Create the planning directory and the research plan using an LlmAgent
-        toolset = toolset_registry.get_desktop_commander_toolset()
+        toolset = get_toolset_registry().get_desktop_commander_toolset()
         
         # Define instruction provider that injects template variables
         def instruction_provider(inner_ctx: ReadonlyContext) -> str:
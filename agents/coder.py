@@ -21,8 +21,8 @@ class CoderAgent(LlmAgent):
 
 def get_coder_agent():
     """Create Coder agent with execution-mode-aware tools."""
-    from ..tools.toolset_registry import toolset_registry
-    desktop_commander_toolset = toolset_registry.get_desktop_commander_toolset()
+    from ..tools.toolset_registry import get_toolset_registry
+    desktop_commander_toolset = get_toolset_registry().get_desktop_commander_toolset()
     tools = [desktop_commander_toolset]
     
     # Create instruction provider for dynamic template variable injection with context pre-loading
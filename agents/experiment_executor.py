@@ -27,8 +27,8 @@ def get_experiment_executor_agent():
     agent_name = "Experiment_Executor"
     
     # Get tools from the registry
-    from ..tools.toolset_registry import toolset_registry
-    desktop_commander_toolset = toolset_registry.get_desktop_commander_toolset()
+    from ..tools.toolset_registry import get_toolset_registry
+    desktop_commander_toolset = get_toolset_registry().get_desktop_commander_toolset()
     
     tools = [desktop_commander_toolset]
         
@@ -46,8 +46,8 @@ def get_orchestrator_agent():
     """Creates and returns the Orchestrator agent."""
     agent_name = "Orchestrator"
     
-    from ..tools.toolset_registry import toolset_registry
-    desktop_commander_toolset = toolset_registry.get_desktop_commander_toolset()
+    from ..tools.toolset_registry import get_toolset_registry
+    desktop_commander_toolset = get_toolset_registry().get_desktop_commander_toolset()
     
     tools = [desktop_commander_toolset]
         
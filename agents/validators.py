@@ -39,7 +39,7 @@ class ContextAwareValidatorAgent(BaseAgent):
         self._default_instruction = default_instruction
 
     async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
-        from ..tools.toolset_registry import toolset_registry
+        from ..tools.toolset_registry import get_toolset_registry
         from ..tools.json_validator import json_validator_tool
         from ..prompts.builder import inject_template_variables_with_context_preloading
 
@@ -54,7 +54,7 @@ class ContextAwareValidatorAgent(BaseAgent):
             # Pass the full ctx to the preloader, not the readonly_ctx, to ensure access to the live session state.
             return inject_template_variables_with_context_preloading(instruction, ctx, self._agent_name)
 
-        desktop_commander_toolset = toolset_registry.get_desktop_commander_toolset()
+        desktop_commander_toolset = get_toolset_registry().get_desktop_commander_toolset()
         tools = [desktop_commander_toolset, json_validator_tool]
 
         validator_llm_agent = LlmAgent(
@@ -98,8 +98,8 @@ def create_specialized_parallel_validator(validator_type: str, index: int, valid
     """Create a specialized validator for parallel validation based on context."""
     
     # Use the centralized toolset registry
-    from ..tools.toolset_registry import toolset_registry
-    desktop_commander_toolset = toolset_registry.get_desktop_commander_toolset()
+    from ..tools.toolset_registry import get_toolset_registry
+    desktop_commander_toolset = get_toolset_registry().get_desktop_commander_toolset()
     
     tools = [desktop_commander_toolset]
     
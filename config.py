@@ -80,6 +80,49 @@ MICRO_CHECKPOINT_MAX_RETRIES = int(os.getenv("MICRO_CHECKPOINT_MAX_RETRIES", "3"
 # Default timeout in seconds for a single micro-checkpoint step.
 MICRO_CHECKPOINT_TIMEOUT = int(os.getenv("MICRO_CHECKPOINT_TIMEOUT", "300"))  # 5 minutes
 
+# Every Nth step-log entry also records the operation state for replay; 0 records it only
+# in the operation file.
+MICRO_CHECKPOINT_STATE_INTERVAL = int(os.getenv("MICRO_CHECKPOINT_STATE_INTERVAL", "10"))
+
+# The operation file is rewritten with the current progress every Nth completed/failed step;
+# in between, progress is recovered by replaying the step log. 0 or 1 rewrites it after every step.
+OPERATION_FILE_REWRITE_INTERVAL = int(os.getenv("OPERATION_FILE_REWRITE_INTERVAL", "10"))
+
+# How state snapshots capture the outputs directory: "zip" archives it, "clone" mirrors it as
+# a directory of reflinks (near-instant and copy-on-write on btrfs/XFS) or plain copies where the
+# filesystem cannot clone; "hardlink" is accepted as an older name for "clone".
+# "incremental" copies changed files and hard-links unchanged ones to the previous snapshot's copy.
+# "content" stores each distinct file once in a task-wide store keyed by BLAKE2b digest and
+# writes a per-snapshot manifest of digests, deduplicating across all snapshots and paths.
+# "tar" streams the tree into one sequentially written tar file, zstd-compressed when
+# SNAPSHOT_COMPRESSION is "zstd".
+SNAPSHOT_MODE = os.getenv("SNAPSHOT_MODE", "zip").lower()
+
+# Comma-separated shell-style patterns for outputs files and directories that state snapshots
+# skip, e.g. "*.parquet,*.csv,*.pkl,data/raw" for bulky data that can be regenerated. A pattern
+# matches a path relative to the outputs directory or a bare name. Restoring a snapshot leaves
+# matching paths in the outputs directory untouched.
+SNAPSHOT_EXCLUDE_PATTERNS = tuple(
+    pattern.strip() for pattern in os.getenv("SNAPSHOT_EXCLUDE_PATTERNS", "").split(",") if pattern.strip()
+)
+
+# Encoding of the session state inside each snapshot: "json", "msgpack" (smaller and faster,
+# requires the msgpack package; falls back to JSON without it) or "pickle" (protocol 5, keeps
+# numpy/pandas values intact instead of stringifying them and writes their buffers out-of-band
+# to a sidecar file; only use it with a trusted checkpoints directory). JSON and msgpack
+# snapshots load under any setting; pickled ones only load while this is "pickle".
+STATE_SNAPSHOT_FORMAT = os.getenv("STATE_SNAPSHOT_FORMAT", "json").lower()
+
+# Compression for snapshot state files and "tar" outputs snapshots: "none" or "zstd" (requires
+# the zstandard package; falls back to uncompressed without it). Compressed and plain snapshots
+# both load.
+SNAPSHOT_COMPRESSION = os.getenv("SNAPSHOT_COMPRESSION", "none").lower()
+
+# If True, state snapshots are written by a background thread so the workflow does not wait on
+# the outputs copy. The state itself is captured at call time, but files the next phase writes
+# before the copy reaches them can land in the snapshot, so it is off by default.
+ASYNC_STATE_SNAPSHOTS = os.getenv("ASYNC_STATE_SNAPSHOTS", "false").lower() == "true"
+
 # ==============================================================================
 # --- DIRECTORY & PATH CONFIGURATION ---
 # ==============================================================================
@@ -96,11 +139,16 @@ OUTPUTS_BASE_DIR = os.path.join(_BASE_DIR, "outputs")
 # Root directory for all checkpoint data.
 CHECKPOINTS_BASE_DIR = os.path.join(_BASE_DIR, "checkpoints")
 
+# Task directories already created by this process; lets repeated path lookups skip os.makedirs.
+_ENSURED_DIRS = set()
+
 def get_task_specific_dir(base_dir: str, task_id: str = None) -> str:
     """Helper to get a task-specific directory path."""
     current_task_id = task_id or TASK_ID
     path = os.path.join(base_dir, current_task_id)
-    os.makedirs(path, exist_ok=True)
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
     return path
 
 def get_outputs_dir(task_id: str = None) -> str:
@@ -128,6 +176,10 @@ DESKTOP_COMMANDER_ARGS: List[str] = ["-y", "@wonderwhy-er/desktop-commander"]
 # Timeout in seconds for MCP tool operations.
 MCP_TIMEOUT_SECONDS = int(os.getenv("MCP_TIMEOUT_SECONDS", "180"))
 
+# Desktop Commander line limits, passed to the server as environment variables at spawn.
+DC_FILE_WRITE_LINE_LIMIT = int(os.getenv("DC_FILE_WRITE_LINE_LIMIT", "2000"))
+DC_FILE_READ_LINE_LIMIT = int(os.getenv("DC_FILE_READ_LINE_LIMIT", "7000"))
+
 # ==============================================================================
 # --- LOGGING & SAFETY ---
 # ==============================================================================
@@ -46,26 +46,11 @@ os.environ['LITELLM_RETRY_STRATEGY'] = 'exponential_backoff'
 
 async def initialize_toolset():
     """Initialize the MCP toolset and register it globally."""
-    from .tools.toolset_registry import toolset_registry
-    from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioConnectionParams
-    from mcp.client.stdio import StdioServerParameters
-    
+    from .tools.toolset_registry import get_toolset_registry
+
     logger.info("🔧 Initializing MCP toolset...")
-    
-    project_root = os.path.dirname(os.path.abspath(__file__))
-    
-    toolset = MCPToolset(
-        connection_params=StdioConnectionParams(
-            server_params=StdioServerParameters(
-                command=config.DESKTOP_COMMANDER_COMMAND,
-                args=config.DESKTOP_COMMANDER_ARGS,
-                cwd=project_root
-            ),
-            timeout=config.MCP_TIMEOUT_SECONDS
-        )
-    )
-    
-    toolset_registry.set_desktop_commander_toolset(toolset)
+
+    await get_toolset_registry().aget_desktop_commander_toolset()
     logger.info("✅ Successfully initialized MCP toolset.")
 
 
@@ -172,8 +157,8 @@ async def main(resume: bool = True):
             logger.error(f"\n❌ Workflow execution error: {e}", exc_info=True)
         
         try:
-            from .tools.toolset_registry import toolset_registry
-            toolset_registry.cleanup()
+            from .tools.toolset_registry import get_toolset_registry
+            await get_toolset_registry().cleanup()
         except Exception:
             pass
     finally:
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# /department_of_market_intelligence/tests/test_agent_context_preloader.py
+"""
+Test suite for agent context pre-loading.
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import department_of_market_intelligence.config as config
+from department_of_market_intelligence.utils.agent_context_preloader import AgentContextPreloader
+
+
+class PreloaderTestCase(unittest.TestCase):
+    """Points outputs at a temporary directory and starts with an empty context cache."""
+
+    def setUp(self):
+        self._saved_outputs_base_dir = config.OUTPUTS_BASE_DIR
+        self.temp_dir = tempfile.mkdtemp()
+        config.OUTPUTS_BASE_DIR = os.path.join(self.temp_dir, "outputs")
+        config._ENSURED_DIRS.clear()
+        AgentContextPreloader._CTX_CACHE.clear()
+
+    def tearDown(self):
+        config.OUTPUTS_BASE_DIR = self._saved_outputs_base_dir
+        config._ENSURED_DIRS.clear()
+        AgentContextPreloader._CTX_CACHE.clear()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, name, data):
+        path = os.path.join(self.temp_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+
+class TestBoundedReads(PreloaderTestCase):
+    """Oversized files are read as head and tail only."""
+
+    def test_small_file_is_read_whole(self):
+        """Test that a file within the limit is returned in full, stripped."""
+        path = self._write("small.md", b"  line one\r\nline two\n")
+        self.assertEqual(AgentContextPreloader._load_single_file(path, max_bytes=100), "line one\nline two")
+
+    def test_large_file_keeps_head_and_tail(self):
+        """Test that a file over the limit keeps its head and tail around a truncation notice."""
+        path = self._write("large.md", b"h" * 1000 + b"MIDDLE" + b"t" * 1000)
+
+        content = AgentContextPreloader._load_single_file(path, max_bytes=100)
+        self.assertTrue(content.startswith("h" * 80))
+        self.assertTrue(content.endswith("t" * 20))
+        self.assertNotIn("MIDDLE", content)
+        self.assertIn("[TRUNCATED: 1906 bytes omitted from large.md]", content)
+
+    def test_missing_file_is_empty(self):
+        """Test that a missing file loads as empty content rather than raising."""
+        self.assertEqual(AgentContextPreloader._load_single_file(os.path.join(self.temp_dir, "nope.md")), "")
+
+
+class TestContextBudget(PreloaderTestCase):
+    """Loaders are given the remaining context budget and stop reading once it is spent."""
+
+    def test_directory_stops_at_budget(self):
+        """Test that a directory load reads newest files first and skips those past the budget."""
+        for age, name in enumerate(("new.md", "mid.md", "old.md")):
+            path = self._write(os.path.join("critiques", name), name.encode() * 20)
+            os.utime(path, (1_000_000 - age, 1_000_000 - age))
+
+        content = AgentContextPreloader._load_directory(os.path.join(self.temp_dir, "critiques") + "/", max_bytes=240)
+        self.assertIn("### new.md ###", content)
+        self.assertIn("### mid.md ###", content)
+        self.assertNotIn("### old.md ###", content)
+
+    def test_later_items_get_remaining_budget(self):
+        """Test that once earlier items use most of the total budget, later reads are capped to the rest."""
+        task = self._write("task.md", b"t" * 250)
+        artifact = self._write("artifact.md", b"a" * 1000)
+        plan = self._write("plan.md", b"p" * 100)
+        session_state = {
+            "task_id": "budget_task",
+            "task_file_path": task,
+            "validation": {"artifact_to_validate": artifact, "plan_artifact_name": plan},
+        }
+
+        with mock.patch.object(AgentContextPreloader, "MAX_TOTAL_CONTEXT_CHARS", 300):
+            context = AgentContextPreloader.preload_context_for_agent("Junior_Validator", session_state)
+        self.assertEqual(context["task_description"], "t" * 250)
+        self.assertTrue(context["artifact_content"].startswith("a" * 40))
+        self.assertIn("[TRUNCATED: 950 bytes omitted from artifact.md]", context["artifact_content"])
+        self.assertNotIn("research_plan", context)
+
+
+
+class TestContextCache(PreloaderTestCase):
+    """Contexts built over unchanged files are reused without reading them again."""
+
+    def setUp(self):
+        super().setUp()
+        self.task = self._write("task.md", b"task v1")
+        self.session_state = {"task_id": "cache_task", "task_file_path": self.task}
+
+    def _preload(self):
+        return AgentContextPreloader.preload_context_for_agent("Orchestrator", self.session_state)
+
+    def test_repeat_call_reads_nothing(self):
+        """Test that a second preload over unchanged files is served from the cache."""
+        first = self._preload()
+        with mock.patch.object(AgentContextPreloader, "_load_single_file") as load:
+            second = self._preload()
+        load.assert_not_called()
+        self.assertEqual(second, {"task_description": "task v1"})
+
+        # Callers get their own copy, so editing one does not touch the cache
+        second["task_description"] = "changed by caller"
+        self.assertEqual(self._preload(), first)
+
+    def test_changed_file_misses(self):
+        """Test that editing a source file rebuilds the context."""
+        self._preload()
+        with open(self.task, "wb") as f:
+            f.write(b"task v2")
+        os.utime(self.task, ns=(1, 1))
+
+        self.assertEqual(self._preload(), {"task_description": "task v2"})
+
+    def test_cache_is_bounded(self):
+        """Test that only the most recent contexts are kept."""
+        for i in range(AgentContextPreloader._CTX_CACHE_MAX + 3):
+            self.session_state["task_file_path"] = self._write(f"task{i}.md", b"task")
+            self._preload()
+        self.assertEqual(len(AgentContextPreloader._CTX_CACHE), AgentContextPreloader._CTX_CACHE_MAX)
+
+
+if __name__ == "__main__":
+    unittest.main()
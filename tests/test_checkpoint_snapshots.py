@@ -0,0 +1,478 @@
+#!/usr/bin/env python3
+# /department_of_market_intelligence/tests/test_checkpoint_snapshots.py
+"""
+Test suite for checkpoint state snapshots.
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import pickle
+from datetime import date
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import department_of_market_intelligence.config as config
+from department_of_market_intelligence.utils import checkpoint_manager
+from department_of_market_intelligence.utils.checkpoint_manager import CheckpointManager
+from department_of_market_intelligence.utils.state_model import DOMISessionState
+
+TEST_TASK_ID = "test_snapshot_task"
+# Settings each test may change; restored in tearDown
+_CONFIG_NAMES = (
+    "OUTPUTS_BASE_DIR", "CHECKPOINTS_BASE_DIR", "SNAPSHOT_MODE", "SNAPSHOT_EXCLUDE_PATTERNS",
+    "STATE_SNAPSHOT_FORMAT", "SNAPSHOT_COMPRESSION", "ASYNC_STATE_SNAPSHOTS",
+)
+
+
+def _read_tree(root):
+    """Return {relative path: contents} for every file under root."""
+    tree = {}
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            with open(path) as f:
+                tree[os.path.relpath(path, root)] = f.read()
+    return tree
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+class CheckpointTestCase(unittest.TestCase):
+    """Points checkpoints and outputs at a temporary directory."""
+
+    def setUp(self):
+        self._saved_config = {name: getattr(config, name) for name in _CONFIG_NAMES}
+        self.temp_dir = tempfile.mkdtemp()
+        config.OUTPUTS_BASE_DIR = os.path.join(self.temp_dir, "outputs")
+        config.CHECKPOINTS_BASE_DIR = os.path.join(self.temp_dir, "checkpoints")
+        config.SNAPSHOT_MODE = "zip"
+        config.SNAPSHOT_EXCLUDE_PATTERNS = ()
+        config.STATE_SNAPSHOT_FORMAT = "json"
+        config.SNAPSHOT_COMPRESSION = "none"
+        config.ASYNC_STATE_SNAPSHOTS = False
+        config._ENSURED_DIRS.clear()
+        self.outputs_dir = config.get_outputs_dir(TEST_TASK_ID)
+        os.makedirs(self.outputs_dir, exist_ok=True)
+
+    def tearDown(self):
+        for name, value in self._saved_config.items():
+            setattr(config, name, value)
+        config._ENSURED_DIRS.clear()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _assert_round_trip(self, mode):
+        """Save two snapshots in mode, edit outputs, and check the restore matches the second."""
+        config.SNAPSHOT_MODE = mode
+        manager = CheckpointManager(TEST_TASK_ID)
+        _write(os.path.join(self.outputs_dir, "planning", "plan.md"), "v1")
+        _write(os.path.join(self.outputs_dir, "summary.md"), "summary")
+        state = DOMISessionState(task_id=TEST_TASK_ID, current_phase="planning")
+        manager.save_state_snapshot(state, "planning")
+
+        # The second snapshot reuses or diffs against the first, depending on the mode
+        _write(os.path.join(self.outputs_dir, "planning", "plan.md"), "v2 is longer")
+        _write(os.path.join(self.outputs_dir, "results", "table.csv"), "a,b")
+        state.current_phase = "execution"
+        manager.save_state_snapshot(state, "execution")
+        expected = _read_tree(self.outputs_dir)
+
+        # Edits made after the snapshot must not leak into it
+        _write(os.path.join(self.outputs_dir, "planning", "plan.md"), "edited later")
+        _write(os.path.join(self.outputs_dir, "stray.txt"), "not in any snapshot")
+        os.remove(os.path.join(self.outputs_dir, "summary.md"))
+
+        restored = CheckpointManager(TEST_TASK_ID).load_latest_snapshot()
+        self.assertIsNotNone(restored)
+        self.assertEqual(restored.current_phase, "execution")
+        self.assertEqual(_read_tree(self.outputs_dir), expected)
+
+
+class TestDirectorySnapshots(CheckpointTestCase):
+    """Outputs copied into a snapshot directory by cloning or hard-linking files."""
+
+    def test_clone_round_trip(self):
+        """Test that clone snapshots restore outputs exactly as saved."""
+        self._assert_round_trip("clone")
+
+    def test_hardlink_round_trip(self):
+        """Test that in-place edits after a hardlink snapshot do not reach the snapshot."""
+        self._assert_round_trip("hardlink")
+
+    def test_restore_into_missing_outputs_dir(self):
+        """Test that restoring recreates an outputs directory that was removed."""
+        for mode in ("clone", "hardlink"):
+            with self.subTest(mode=mode):
+                config.SNAPSHOT_MODE = mode
+                manager = CheckpointManager(TEST_TASK_ID)
+                _write(os.path.join(self.outputs_dir, "a", "b", "f.txt"), "kept")
+                manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "planning")
+                shutil.rmtree(self.outputs_dir)
+
+                self.assertIsNotNone(manager.load_latest_snapshot())
+                self.assertEqual(_read_tree(self.outputs_dir), {os.path.join("a", "b", "f.txt"): "kept"})
+                shutil.rmtree(config.CHECKPOINTS_BASE_DIR)
+                config._ENSURED_DIRS.clear()
+
+
+class TestZipSnapshots(CheckpointTestCase):
+    """Outputs archived into a zip file and restored from it."""
+
+    def test_zip_round_trip(self):
+        """Test that zip snapshots restore outputs exactly as saved."""
+        self._assert_round_trip("zip")
+
+    def test_zip_restore_of_empty_outputs(self):
+        """Test that restoring a zip snapshot of empty outputs clears files added since."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "planning")
+        _write(os.path.join(self.outputs_dir, "late", "file.md"), "added after the snapshot")
+
+        self.assertIsNotNone(manager.load_latest_snapshot())
+        self.assertTrue(os.path.isdir(self.outputs_dir))
+        self.assertEqual(_read_tree(self.outputs_dir), {})
+
+
+class TestIncrementalSnapshots(CheckpointTestCase):
+    """Outputs copied per snapshot, linking files unchanged since the previous one."""
+
+    def test_incremental_round_trip(self):
+        """Test that incremental snapshots restore outputs exactly as saved."""
+        self._assert_round_trip("incremental")
+
+    def test_unchanged_files_link_previous_copy(self):
+        """Test that unchanged files link the previous snapshot's copy rather than the live file."""
+        config.SNAPSHOT_MODE = "incremental"
+        manager = CheckpointManager(TEST_TASK_ID)
+        _write(os.path.join(self.outputs_dir, "same.md"), "unchanged")
+        _write(os.path.join(self.outputs_dir, "edited.md"), "v1")
+        manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "planning")
+        _write(os.path.join(self.outputs_dir, "edited.md"), "v2 is longer")
+        manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "execution")
+
+        newest, older = (os.path.join(manager.checkpoints_dir, name, "outputs_snapshot")
+                         for name in manager.get_sorted_snapshots())
+        same = os.stat(os.path.join(newest, "same.md"))
+        self.assertEqual(same.st_ino, os.stat(os.path.join(older, "same.md")).st_ino)
+        self.assertNotEqual(same.st_ino, os.stat(os.path.join(self.outputs_dir, "same.md")).st_ino)
+        self.assertNotEqual(os.stat(os.path.join(newest, "edited.md")).st_ino,
+                            os.stat(os.path.join(older, "edited.md")).st_ino)
+
+
+class TestContentSnapshots(CheckpointTestCase):
+    """Outputs recorded as a manifest of hashes over a shared blob store."""
+
+    def test_content_round_trip(self):
+        """Test that content snapshots restore outputs exactly as saved."""
+        self._assert_round_trip("content")
+
+    def test_identical_files_stored_once(self):
+        """Test that files with the same contents share one blob across paths and snapshots."""
+        config.SNAPSHOT_MODE = "content"
+        manager = CheckpointManager(TEST_TASK_ID)
+        _write(os.path.join(self.outputs_dir, "a.md"), "same")
+        _write(os.path.join(self.outputs_dir, "copy", "b.md"), "same")
+        manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "planning")
+        _write(os.path.join(self.outputs_dir, "c.md"), "same")
+        manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "execution")
+
+        self.assertEqual(len(_read_tree(manager.objects_dir)), 1)
+
+
+class TestTarSnapshots(CheckpointTestCase):
+    """Outputs streamed into a single tar file."""
+
+    def test_tar_round_trip(self):
+        """Test that tar snapshots restore outputs exactly as saved."""
+        self._assert_round_trip("tar")
+
+
+class TestAsyncSnapshots(CheckpointTestCase):
+    """Snapshots written by the background writer when ASYNC_STATE_SNAPSHOTS is on."""
+
+    def setUp(self):
+        super().setUp()
+        config.ASYNC_STATE_SNAPSHOTS = True
+
+    def test_flush_completes_pending_snapshot(self):
+        """Test that flush() waits for the background snapshot to be written."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        _write(os.path.join(self.outputs_dir, "report.md"), "v1")
+        manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID, current_phase="planning"), "planning")
+        manager.flush()
+
+        self.assertIsNone(manager._pending_snapshot)
+        self.assertEqual(len(manager.get_sorted_snapshots()), 1)
+        _write(os.path.join(self.outputs_dir, "report.md"), "edited later")
+        self.assertEqual(CheckpointManager(TEST_TASK_ID).load_latest_snapshot().current_phase, "planning")
+        self.assertEqual(_read_tree(self.outputs_dir), {"report.md": "v1"})
+
+    def test_state_is_captured_at_save_time(self):
+        """Test that state changes after save_state_snapshot() returns do not reach the snapshot."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        state = DOMISessionState(task_id=TEST_TASK_ID, current_phase="planning")
+        manager.save_state_snapshot(state, "planning")
+        state.current_phase = "execution"
+
+        self.assertTrue(manager.has_snapshot())
+        self.assertEqual(manager.load_latest_snapshot().current_phase, "planning")
+
+    def test_failed_background_snapshot_is_logged(self):
+        """Test that a background failure is logged on the next wait instead of raised."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        with mock.patch.object(CheckpointManager, "_snapshot_outputs", side_effect=OSError("disk full")):
+            manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "planning")
+            with mock.patch.object(checkpoint_manager.logger, "error") as log_error:
+                manager.flush()
+        log_error.assert_called_once()
+        self.assertIsNone(manager._pending_snapshot)
+
+
+class TestPickleStateFormat(CheckpointTestCase):
+    """Session state pickled with protocol 5 when STATE_SNAPSHOT_FORMAT is "pickle"."""
+
+    def setUp(self):
+        super().setUp()
+        config.STATE_SNAPSHOT_FORMAT = "pickle"
+
+    def test_pickle_round_trip(self):
+        """Test that pickled state keeps Python types and out-of-band buffers."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        metadata = {"as_of": date(2024, 1, 2), "raw": pickle.PickleBuffer(bytearray(b"tick data"))}
+        manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID, metadata=metadata), "planning")
+
+        snapshot_dir = os.path.join(manager.checkpoints_dir, manager.get_sorted_snapshots()[0])
+        self.assertTrue(os.path.exists(os.path.join(snapshot_dir, "domi_state.pickle.buffers")))
+        restored = CheckpointManager(TEST_TASK_ID).load_latest_snapshot()
+        self.assertEqual(restored.metadata["as_of"], date(2024, 1, 2))
+        self.assertEqual(bytes(restored.metadata["raw"]), b"tick data")
+
+    def test_pickled_state_refused_without_pickle_format(self):
+        """Test that pickled state is not loaded unless the pickle format is configured."""
+        CheckpointManager(TEST_TASK_ID).save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "planning")
+
+        config.STATE_SNAPSHOT_FORMAT = "json"
+        with mock.patch.object(pickle, "loads") as pickle_loads:
+            with self.assertRaises(RuntimeError):
+                CheckpointManager(TEST_TASK_ID).load_latest_snapshot()
+        pickle_loads.assert_not_called()
+
+
+class TestMsgpackStateFormat(CheckpointTestCase):
+    """Session state encoded with MessagePack when STATE_SNAPSHOT_FORMAT is "msgpack"."""
+
+    def setUp(self):
+        super().setUp()
+        config.STATE_SNAPSHOT_FORMAT = "msgpack"
+
+    @unittest.skipUnless(checkpoint_manager.msgpack, "msgpack not installed")
+    def test_msgpack_round_trip(self):
+        """Test that msgpack state restores as saved."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID, metadata={"n": 1}), "planning")
+
+        snapshot_dir = os.path.join(manager.checkpoints_dir, manager.get_sorted_snapshots()[0])
+        self.assertTrue(os.path.exists(os.path.join(snapshot_dir, "domi_state.msgpack")))
+        self.assertEqual(CheckpointManager(TEST_TASK_ID).load_latest_snapshot().metadata, {"n": 1})
+
+    def test_missing_msgpack_falls_back_to_json(self):
+        """Test that without msgpack the state is written as JSON and the fallback warned once."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        with mock.patch.object(checkpoint_manager, "msgpack", None), \
+                mock.patch.object(checkpoint_manager, "_WARNED_FALLBACKS", set()), \
+                mock.patch.object(checkpoint_manager.logger, "warning") as log_warning:
+            manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "planning")
+            manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "execution")
+            self.assertIsNotNone(CheckpointManager(TEST_TASK_ID).load_latest_snapshot())
+
+        log_warning.assert_called_once()
+        for name in manager.get_sorted_snapshots():
+            self.assertTrue(os.path.exists(os.path.join(manager.checkpoints_dir, name, "domi_state.json")))
+
+    def test_msgpack_state_needs_msgpack_to_load(self):
+        """Test that loading msgpack state without the package raises instead of returning nothing."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        snapshot_dir = os.path.join(manager.checkpoints_dir, "snapshot_planning_20250101T000000000000Z")
+        _write(os.path.join(snapshot_dir, "domi_state.msgpack"), "")
+
+        with mock.patch.object(checkpoint_manager, "msgpack", None):
+            with self.assertRaises(RuntimeError):
+                manager.load_latest_snapshot()
+
+
+class TestZstdStateCompression(CheckpointTestCase):
+    """Session state compressed with zstd when SNAPSHOT_COMPRESSION is "zstd"."""
+
+    def setUp(self):
+        super().setUp()
+        config.SNAPSHOT_COMPRESSION = "zstd"
+
+    @unittest.skipUnless(checkpoint_manager.zstandard, "zstandard not installed")
+    def test_zstd_round_trip(self):
+        """Test that compressed state restores as saved."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID, metadata={"n": 1}), "planning")
+
+        snapshot_dir = os.path.join(manager.checkpoints_dir, manager.get_sorted_snapshots()[0])
+        self.assertTrue(os.path.exists(os.path.join(snapshot_dir, "domi_state.json.zst")))
+        self.assertEqual(CheckpointManager(TEST_TASK_ID).load_latest_snapshot().metadata, {"n": 1})
+
+    def test_missing_zstandard_writes_uncompressed(self):
+        """Test that without zstandard the state is written uncompressed and the fallback warned once."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        with mock.patch.object(checkpoint_manager, "zstandard", None), \
+                mock.patch.object(checkpoint_manager, "_WARNED_FALLBACKS", set()), \
+                mock.patch.object(checkpoint_manager.logger, "warning") as log_warning:
+            manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "planning")
+            manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "execution")
+            self.assertIsNotNone(CheckpointManager(TEST_TASK_ID).load_latest_snapshot())
+
+        log_warning.assert_called_once()
+        for name in manager.get_sorted_snapshots():
+            self.assertTrue(os.path.exists(os.path.join(manager.checkpoints_dir, name, "domi_state.json")))
+
+    def test_compressed_state_needs_zstandard_to_load(self):
+        """Test that loading compressed state without the package raises instead of returning nothing."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        snapshot_dir = os.path.join(manager.checkpoints_dir, "snapshot_planning_20250101T000000000000Z")
+        _write(os.path.join(snapshot_dir, "domi_state.json.zst"), "")
+
+        with mock.patch.object(checkpoint_manager, "zstandard", None):
+            with self.assertRaises(RuntimeError):
+                manager.load_latest_snapshot()
+
+
+class TestUnchangedOutputsReuse(CheckpointTestCase):
+    """A snapshot of unchanged outputs links the previous snapshot's copy."""
+
+    def test_unchanged_outputs_link_previous_copy(self):
+        """Test that an unchanged zip or clone copy is linked, and still restores."""
+        for mode, copy_name in (("zip", "outputs_snapshot.zip"), ("clone", "outputs_snapshot")):
+            with self.subTest(mode=mode):
+                config.SNAPSHOT_MODE = mode
+                manager = CheckpointManager(TEST_TASK_ID)
+                _write(os.path.join(self.outputs_dir, "report.md"), "v1")
+                manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "planning")
+                manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "execution")
+
+                newest, older = (os.path.join(manager.checkpoints_dir, name, copy_name)
+                                 for name in manager.get_sorted_snapshots())
+                # Symlinked for directories, hard-linked for the zip archive
+                self.assertTrue(os.path.samefile(newest, older))
+
+                _write(os.path.join(self.outputs_dir, "report.md"), "edited later")
+                self.assertEqual(CheckpointManager(TEST_TASK_ID).load_latest_snapshot().current_phase,
+                                 "research_planning")
+                self.assertEqual(_read_tree(self.outputs_dir), {"report.md": "v1"})
+                shutil.rmtree(config.CHECKPOINTS_BASE_DIR)
+                config._ENSURED_DIRS.clear()
+
+    def test_changed_outputs_are_copied(self):
+        """Test that any change to the outputs since the last snapshot gets a fresh copy."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        _write(os.path.join(self.outputs_dir, "report.md"), "v1")
+        manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "planning")
+        _write(os.path.join(self.outputs_dir, "report.md"), "v2 is longer")
+        manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "execution")
+
+        newest, older = (os.path.join(manager.checkpoints_dir, name, "outputs_snapshot.zip")
+                         for name in manager.get_sorted_snapshots())
+        self.assertFalse(os.path.samefile(newest, older))
+
+
+class TestLatestSnapshotPointer(CheckpointTestCase):
+    """The newest snapshot is found through the latest_snapshot pointer file."""
+
+    def _save(self, manager, phase):
+        manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID, current_phase=phase), phase)
+
+    def test_pointer_names_newest_snapshot(self):
+        """Test that each save moves the pointer to the snapshot it wrote."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        self._save(manager, "planning")
+        self._save(manager, "execution")
+
+        with open(os.path.join(manager.checkpoints_dir, "latest_snapshot")) as f:
+            self.assertEqual(f.read(), manager.get_sorted_snapshots()[0])
+        self.assertTrue(manager.get_sorted_snapshots()[0].startswith("snapshot_execution_"))
+
+    def test_new_manager_reads_pointer_without_listing(self):
+        """Test that a fresh manager resolves the latest snapshot from the pointer alone."""
+        self._save(CheckpointManager(TEST_TASK_ID), "planning")
+
+        manager = CheckpointManager(TEST_TASK_ID)
+        with mock.patch.object(CheckpointManager, "get_sorted_snapshots", side_effect=AssertionError("listed")):
+            self.assertTrue(manager.has_snapshot())
+            self.assertEqual(manager.load_latest_snapshot().current_phase, "planning")
+
+    def test_stale_pointer_falls_back_to_listing(self):
+        """Test that a pointer to a removed snapshot is ignored in favour of the directory listing."""
+        manager = CheckpointManager(TEST_TASK_ID)
+        self._save(manager, "planning")
+        self._save(manager, "execution")
+        newest, older = manager.get_sorted_snapshots()
+        shutil.rmtree(os.path.join(manager.checkpoints_dir, newest))
+
+        restored = CheckpointManager(TEST_TASK_ID).load_latest_snapshot()
+        self.assertEqual(restored.current_phase, "planning")
+        self.assertTrue(older.startswith("snapshot_planning_"))
+
+
+class TestSnapshotExclusions(CheckpointTestCase):
+    """Paths matching SNAPSHOT_EXCLUDE_PATTERNS are left out of snapshots."""
+
+    def test_excluded_paths_survive_restore(self):
+        """Test that excluded paths are neither saved nor removed by a restore."""
+        config.SNAPSHOT_EXCLUDE_PATTERNS = ("data/raw",)
+        for mode in ("zip", "clone", "tar"):
+            with self.subTest(mode=mode):
+                config.SNAPSHOT_MODE = mode
+                manager = CheckpointManager(TEST_TASK_ID)
+                _write(os.path.join(self.outputs_dir, "report.md"), "v1")
+                _write(os.path.join(self.outputs_dir, "data", "raw", "ticks.csv"), "big")
+                manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "planning")
+                _write(os.path.join(self.outputs_dir, "report.md"), "v2")
+
+                manager.load_latest_snapshot()
+                self.assertEqual(_read_tree(self.outputs_dir), {
+                    "report.md": "v1",
+                    os.path.join("data", "raw", "ticks.csv"): "big",
+                })
+                shutil.rmtree(config.CHECKPOINTS_BASE_DIR)
+                config._ENSURED_DIRS.clear()
+
+
+class TestRestoreStaging(CheckpointTestCase):
+    """A restore that fails partway must leave the live outputs untouched."""
+
+    def test_failed_zip_restore_keeps_outputs(self):
+        """Test that an extraction error during a zip restore leaves outputs as they were."""
+        config.SNAPSHOT_MODE = "zip"
+        manager = CheckpointManager(TEST_TASK_ID)
+        for i in range(3):
+            _write(os.path.join(self.outputs_dir, f"file{i}.md"), f"saved {i}")
+        manager.save_state_snapshot(DOMISessionState(task_id=TEST_TASK_ID), "planning")
+        for i in range(3):
+            _write(os.path.join(self.outputs_dir, f"file{i}.md"), f"live {i}")
+        live = _read_tree(self.outputs_dir)
+
+        with mock.patch.object(shutil, "copyfileobj", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                manager.load_latest_snapshot()
+        self.assertEqual(_read_tree(self.outputs_dir), live)
+        self.assertEqual(os.listdir(os.path.dirname(self.outputs_dir)), [TEST_TASK_ID])
+
+        manager.load_latest_snapshot()
+        self.assertEqual(_read_tree(self.outputs_dir), {f"file{i}.md": f"saved {i}" for i in range(3)})
+
+
+if __name__ == "__main__":
+    unittest.main()
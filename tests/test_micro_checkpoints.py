@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# /department_of_market_intelligence/tests/test_micro_checkpoints.py
+"""
+Test suite for micro-checkpoint operation tracking and recovery.
+"""
+
+import unittest
+import sys
+import os
+import shutil
+import tempfile
+import gc
+import weakref
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import department_of_market_intelligence.config as config
+from department_of_market_intelligence.utils import checkpoint_manager
+from department_of_market_intelligence.utils.checkpoint_manager import CheckpointManager, OperationStep
+from department_of_market_intelligence.utils.fastjson import loads
+
+# Settings each test may change; restored in tearDown
+_CONFIG_NAMES = ("CHECKPOINTS_BASE_DIR", "ENABLE_MICRO_CHECKPOINTS", "OPERATION_FILE_REWRITE_INTERVAL")
+
+
+def _make_steps(count):
+    return [
+        OperationStep(step_id=f"s{i}", operation_type="test", step_name=f"step {i}",
+                      input_state={}, expected_outputs=[])
+        for i in range(count)
+    ]
+
+
+def _list_files(root):
+    """Return the relative paths of every file under root."""
+    return sorted(
+        os.path.relpath(os.path.join(dirpath, name), root)
+        for dirpath, _dirnames, filenames in os.walk(root) for name in filenames
+    )
+
+
+class MicroCheckpointTestCase(unittest.TestCase):
+    """Points checkpoints at a temporary directory."""
+
+    def setUp(self):
+        self._saved_config = {name: getattr(config, name) for name in _CONFIG_NAMES}
+        self.temp_dir = tempfile.mkdtemp()
+        config.CHECKPOINTS_BASE_DIR = self.temp_dir
+        config.ENABLE_MICRO_CHECKPOINTS = True
+        config._ENSURED_DIRS.clear()
+
+    def tearDown(self):
+        for name, value in self._saved_config.items():
+            setattr(config, name, value)
+        config._ENSURED_DIRS.clear()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+class TestStepLogRecovery(MicroCheckpointTestCase):
+    """Recover operation progress from the operation file and step log."""
+
+    def test_replay_and_resume(self):
+        """Test that resume replays steps logged after the last operation-file rewrite."""
+        manager = CheckpointManager("task_replay")
+        steps = _make_steps(20)
+        manager.start_operation("op_replay", "test_agent", steps, operation_state={"k": 1})
+        for step in steps[:13]:
+            with manager.step_context(step):
+                pass
+        with self.assertRaises(RuntimeError):
+            with manager.step_context(steps[13]):
+                raise RuntimeError("step failed")
+        manager.flush()
+
+        # A crash mid-append leaves a torn last line, which replay must skip
+        log_path = os.path.join(manager.micro_checkpoints_dir, "operation_op_replay.checkpoints.jsonl")
+        with open(log_path, "ab") as f:
+            f.write(b'{"torn')
+
+        recovered = CheckpointManager("task_replay")
+        operations = recovered.list_recoverable_operations()
+        self.assertEqual([op["operation_id"] for op in operations], ["op_replay"])
+        self.assertEqual(operations[0]["progress"], "13/20")
+        self.assertEqual(operations[0]["failed_steps"], 1)
+
+        progress = recovered.resume_operation("op_replay")
+        self.assertEqual(len(progress.completed_steps), 13)
+        self.assertEqual(progress.failed_steps, ["s13"])
+        self.assertEqual(progress.operation_state, {"k": 1})
+
+    def test_completed_operation_is_not_recoverable(self):
+        """Test that operations marked complete are no longer offered for recovery."""
+        manager = CheckpointManager("task_done")
+        steps = _make_steps(1)
+        manager.start_operation("op_done", "test_agent", steps)
+        with manager.step_context(steps[0]):
+            pass
+        manager.mark_operation_complete("op_done")
+
+        self.assertEqual(CheckpointManager("task_done").list_recoverable_operations(), [])
+
+
+class TestTaskSwitch(MicroCheckpointTestCase):
+    """Switching task_id must not carry writes over to the new task."""
+
+    def test_pending_writes_stay_with_previous_task(self):
+        """Test that progress queued before a task switch is written under the old task."""
+        config.OPERATION_FILE_REWRITE_INTERVAL = 2
+        manager = CheckpointManager("task_a")
+        steps = _make_steps(4)
+        manager.start_operation("op_switch", "test_agent", steps)
+        for step in steps[:2]:
+            with manager.step_context(step):
+                pass
+
+        manager.task_id = "task_b"
+        manager.flush()
+
+        prefix = os.path.join("task_a", "micro_checkpoints")
+        self.assertEqual(_list_files(self.temp_dir), [
+            os.path.join(prefix, "operation_op_switch.checkpoints.jsonl"),
+            os.path.join(prefix, "operation_op_switch.json"),
+        ])
+        with open(os.path.join(self.temp_dir, prefix, "operation_op_switch.json"), "rb") as f:
+            self.assertEqual(loads(f.read())["progress"]["completed_steps"], ["s0", "s1"])
+
+    def test_new_task_starts_fresh_step_logs(self):
+        """Test that an operation started after the switch logs under the new task."""
+        manager = CheckpointManager("task_a")
+        steps = _make_steps(1)
+        manager.start_operation("op_a", "test_agent", steps)
+        with manager.step_context(steps[0]):
+            pass
+
+        manager.task_id = "task_b"
+        steps = _make_steps(1)
+        manager.start_operation("op_b", "test_agent", steps)
+        with manager.step_context(steps[0]):
+            pass
+        manager.flush()
+
+        log_b = os.path.join(self.temp_dir, "task_b", "micro_checkpoints", "operation_op_b.checkpoints.jsonl")
+        with open(log_b, "rb") as f:
+            self.assertEqual([loads(line)["phase"] for line in f], ["pre_execution", "completed"])
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "task_a", "micro_checkpoints",
+                                                     "operation_op_b.checkpoints.jsonl")))
+
+
+class TestCheckpointWriter(MicroCheckpointTestCase):
+    """The shared background writer for step logs and operation files."""
+
+    def test_writer_does_not_keep_managers_alive(self):
+        """Test that a manager that wrote step logs can be garbage collected."""
+        manager = CheckpointManager("task_gc")
+        steps = _make_steps(1)
+        manager.start_operation("op_gc", "test_agent", steps)
+        with manager.step_context(steps[0]):
+            pass
+        manager.flush()
+
+        ref = weakref.ref(manager)
+        del manager
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_flush_returns_after_failed_write(self):
+        """Test that flush() still returns when the writer fails on a batch."""
+        config.OPERATION_FILE_REWRITE_INTERVAL = 1
+        manager = CheckpointManager("task_fail")
+        steps = _make_steps(2)
+        manager.start_operation("op_fail", "test_agent", steps)
+
+        with mock.patch.object(checkpoint_manager, "_atomic_write_bytes", side_effect=ValueError("boom")):
+            with manager.step_context(steps[0]):
+                pass
+            manager.flush()
+
+        # The writer survives the failure and keeps serving later writes
+        with manager.step_context(steps[1]):
+            pass
+        manager.flush()
+        with open(os.path.join(manager.micro_checkpoints_dir, "operation_op_fail.json"), "rb") as f:
+            self.assertEqual(loads(f.read())["progress"]["completed_steps"], ["s0", "s1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
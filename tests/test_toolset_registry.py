@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# /department_of_market_intelligence/tests/test_toolset_registry.py
+"""
+Test suite for the pooled MCP toolset registry.
+"""
+
+import unittest
+import sys
+import os
+import asyncio
+from unittest import mock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from department_of_market_intelligence.tools import toolset_registry
+from department_of_market_intelligence.tools.toolset_registry import ToolsetRegistry, get_toolset_registry
+
+KEY_A = ("npx", ("server-a",), "/tmp")
+KEY_B = ("npx", ("server-b",), "/tmp")
+
+
+class FakeToolset:
+    """Stands in for an MCPToolset; records how often it was closed."""
+
+    def __init__(self, key):
+        self.key = key
+        self.close_calls = 0
+
+    async def close(self):
+        self.close_calls += 1
+
+
+class TestToolsetPool(unittest.TestCase):
+    """Toolsets are shared per server configuration and closed by the last release."""
+
+    def setUp(self):
+        patcher = mock.patch.object(ToolsetRegistry, "_create_toolset", side_effect=FakeToolset)
+        self.create_toolset = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.registry = ToolsetRegistry()
+
+    def test_same_key_shares_one_toolset(self):
+        """Test that acquiring a key twice starts one server and returns the same toolset."""
+        first = self.registry.acquire(KEY_A)
+        second = self.registry.acquire(KEY_A)
+        other = self.registry.acquire(KEY_B)
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(self.create_toolset.call_count, 2)
+
+    def test_last_release_closes_toolset(self):
+        """Test that the toolset is closed only when every holder has released it."""
+        toolset = self.registry.acquire(KEY_A)
+        self.registry.acquire(KEY_A)
+
+        asyncio.run(self.registry.release(KEY_A))
+        self.assertEqual(toolset.close_calls, 0)
+        asyncio.run(self.registry.release(KEY_A))
+        self.assertEqual(toolset.close_calls, 1)
+
+        # A later acquire starts a fresh server rather than reusing the closed one
+        self.assertIsNot(self.registry.acquire(KEY_A), toolset)
+
+    def test_release_of_unknown_key_is_ignored(self):
+        """Test that releasing a key that was never acquired does nothing."""
+        asyncio.run(self.registry.release(KEY_A))
+        self.create_toolset.assert_not_called()
+
+    def test_cleanup_releases_shared_toolset(self):
+        """Test that cleanup() drops the registry's own reference to the Desktop Commander toolset."""
+        with mock.patch.object(ToolsetRegistry, "_desktop_commander_key", return_value=KEY_A):
+            shared = self.registry.get_desktop_commander_toolset()
+            self.assertIs(self.registry.get_desktop_commander_toolset(), shared)
+            held = self.registry.acquire(KEY_A)
+
+            asyncio.run(self.registry.cleanup())
+            self.assertEqual(shared.close_calls, 0)
+            asyncio.run(self.registry.release(KEY_A))
+        self.assertIs(held, shared)
+        self.assertEqual(shared.close_calls, 1)
+
+
+
+class TestGetToolsetRegistry(unittest.TestCase):
+    """The global registry is built on first use, not at import."""
+
+    def setUp(self):
+        patcher = mock.patch.object(toolset_registry, "_registry_instance", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_registry_is_created_lazily(self):
+        """Test that no registry exists until get_toolset_registry() is called."""
+        self.assertIsNone(toolset_registry._registry_instance)
+        registry = get_toolset_registry()
+        self.assertIsInstance(registry, ToolsetRegistry)
+        self.assertIs(get_toolset_registry(), registry)
+
+    def test_module_attribute_resolves_to_singleton(self):
+        """Test that the legacy toolset_registry attribute returns the same instance."""
+        from department_of_market_intelligence.tools.toolset_registry import toolset_registry as legacy
+        self.assertIs(legacy, get_toolset_registry())
+        with self.assertRaises(AttributeError):
+            toolset_registry.not_a_registry
+
+
+if __name__ == "__main__":
+    unittest.main()
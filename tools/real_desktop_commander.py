@@ -10,9 +10,47 @@ import json
 import subprocess
 import tempfile
 import os
+from types import MappingProxyType
 from typing import Dict, Any, Optional
 
 
+# Commands Desktop Commander refuses to run. The ordered tuple is what the config
+# reports; the frozenset gives callers O(1) membership tests.
+_BLOCKED_COMMANDS_ORDER = (
+    "mkfs", "format", "mount", "umount", "fdisk", "dd", "parted", 
+    "diskpart", "sudo", "su", "passwd", "adduser", "useradd", 
+    "usermod", "groupadd", "chsh", "visudo", "shutdown", "reboot", 
+    "halt", "poweroff", "init", "iptables", "firewall", "netsh", 
+    "sfc", "bcdedit", "reg", "net", "sc", "runas", "cipher", "takeown"
+)
+BLOCKED_COMMANDS = frozenset(_BLOCKED_COMMANDS_ORDER)
+
+# We know the current configuration from our earlier setup. Built once; nested
+# values are immutable so the copies handed out cannot alter it.
+_BASE_CONFIG: Dict[str, Any] = {
+    "fileWriteLineLimit": 2000,  # Set earlier via MCP tool
+    "fileReadLineLimit": 7000,   # Set earlier via MCP tool
+    "blockedCommands": _BLOCKED_COMMANDS_ORDER,
+    "defaultShell": "bash",
+    "allowedDirectories": (),
+    "telemetryEnabled": True,
+    "version": "0.2.7",
+    "currentClient": MappingProxyType({
+        "name": "claude-code",
+        "version": "1.0.63"
+    }),
+    "systemInfo": MappingProxyType({
+        "platform": "linux",
+        "platformName": "Linux", 
+        "defaultShell": "bash",
+        "pathSeparator": "/",
+        "isWindows": False,
+        "isMacOS": False,
+        "isLinux": True
+    })
+}
+
+
 def get_desktop_commander_config() -> Optional[Dict[str, Any]]:
     """Get Desktop Commander configuration.
     
@@ -20,40 +58,12 @@ def get_desktop_commander_config() -> Optional[Dict[str, Any]]:
     this returns the known configuration state based on our earlier setup.
     
     Returns:
-        Configuration dictionary with current known values
+        Configuration dictionary with current known values. It is a shallow copy of
+        the module-level configuration: list-valued entries are tuples and nested
+        dicts are read-only mappings.
     """
-    # We know the current configuration from our earlier setup
-    current_config = {
-        "fileWriteLineLimit": 2000,  # Set earlier via MCP tool
-        "fileReadLineLimit": 7000,   # Set earlier via MCP tool
-        "blockedCommands": [
-            "mkfs", "format", "mount", "umount", "fdisk", "dd", "parted", 
-            "diskpart", "sudo", "su", "passwd", "adduser", "useradd", 
-            "usermod", "groupadd", "chsh", "visudo", "shutdown", "reboot", 
-            "halt", "poweroff", "init", "iptables", "firewall", "netsh", 
-            "sfc", "bcdedit", "reg", "net", "sc", "runas", "cipher", "takeown"
-        ],
-        "defaultShell": "bash",
-        "allowedDirectories": [],
-        "telemetryEnabled": True,
-        "version": "0.2.7",
-        "currentClient": {
-            "name": "claude-code",
-            "version": "1.0.63"
-        },
-        "systemInfo": {
-            "platform": "linux",
-            "platformName": "Linux", 
-            "defaultShell": "bash",
-            "pathSeparator": "/",
-            "isWindows": False,
-            "isMacOS": False,
-            "isLinux": True
-        }
-    }
-    
     print("📊 Retrieved Desktop Commander configuration (current known state)")
-    return current_config
+    return dict(_BASE_CONFIG)
 
 
 def set_desktop_commander_config(key: str, value: Any) -> bool:
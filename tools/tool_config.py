@@ -138,7 +138,8 @@ def show_full_config() -> None:
     
     print("\n🔧 COMPLETE DESKTOP COMMANDER CONFIGURATION")
     print("="*60)
-    print(json.dumps(config_data, indent=2, sort_keys=True))
+    # Nested sections may be read-only mappings, which json encodes via dict()
+    print(json.dumps(config_data, indent=2, sort_keys=True, default=dict))
     print("="*60)
 
 
@@ -4,35 +4,164 @@ Global toolset registry that shares a single MCP connection.
 This prevents async task conflicts when multiple agents need tools.
 """
 
-from typing import Optional, Any, List
+import asyncio
+import functools
+import os
+import threading
+from dataclasses import dataclass
+from typing import Optional, Any, Dict, Tuple
 from .. import config
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Pool key for an MCP server: (command, args, cwd).
+PoolKey = Tuple[str, Tuple[str, ...], str]
+
+# Working directory for MCP server processes: the package root.
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@functools.lru_cache(maxsize=1)
+def _mcp_env() -> Dict[str, str]:
+    """Environment for spawned Desktop Commander servers, built once.
+
+    Deferred to first spawn so importing the registry does not import mcp.
+    """
+    from mcp.client.stdio import get_default_environment
+
+    return {
+        **get_default_environment(),
+        "DC_FILE_WRITE_LINE_LIMIT": str(config.DC_FILE_WRITE_LINE_LIMIT),
+        "DC_FILE_READ_LINE_LIMIT": str(config.DC_FILE_READ_LINE_LIMIT),
+    }
+
+
+@dataclass
+class _PoolEntry:
+    """An MCP toolset shared by every holder of the same server configuration."""
+    toolset: Any
+    refcount: int = 0
+
 
 class ToolsetRegistry:
-    """Registry that maintains a single shared MCP connection."""
-    
+    """Registry that maintains a single shared MCP connection.
+
+    Toolsets are pooled by server configuration and reference counted: every
+    acquire() must be paired with a release(), and the MCP server is closed
+    when the last holder releases it.
+    """
+
     def __init__(self):
         self._shared_toolset: Optional[Any] = None
-    
+        self._shared_key: Optional[PoolKey] = None
+        # Guards creation so concurrent agent start-up spawns exactly one MCP server.
+        self._init_lock = threading.Lock()
+        self._async_init_lock = asyncio.Lock()
+        self._pool: Dict[PoolKey, _PoolEntry] = {}
+        self._pool_lock = threading.Lock()
+
+    def acquire(self, key: PoolKey) -> Any:
+        """Get the toolset for a server configuration, starting it on first acquire."""
+        with self._pool_lock:
+            entry = self._pool.get(key)
+            if entry is None:
+                entry = _PoolEntry(toolset=self._create_toolset(key))
+                self._pool[key] = entry
+            entry.refcount += 1
+            return entry.toolset
+
+    async def release(self, key: PoolKey):
+        """Drop one reference to a pooled toolset, closing it when none remain."""
+        with self._pool_lock:
+            entry = self._pool.get(key)
+            if entry is None:
+                return
+            entry.refcount -= 1
+            if entry.refcount > 0:
+                return
+            del self._pool[key]
+        await entry.toolset.close()
+        logger.info(f"🔌 Closed MCP toolset: {key[0]} {' '.join(key[1])}")
+
+    async def cleanup(self):
+        """Release the shared Desktop Commander toolset held by the registry."""
+        with self._init_lock:
+            toolset, key = self._shared_toolset, self._shared_key
+            self._shared_toolset = None
+            self._shared_key = None
+        if key is not None:
+            await self.release(key)
+        elif toolset is not None:
+            await toolset.close()
+
     def get_desktop_commander_toolset(self) -> Any:
-        """Get shared toolset to prevent MCP connection conflicts."""
-        if self._shared_toolset is None:
-            raise RuntimeError("Toolset not initialized. Call set_desktop_commander_toolset first.")
-        return self._shared_toolset
-    
+        """Get shared toolset to prevent MCP connection conflicts.
+
+        The toolset is created on first use; later calls take the lock-free fast path.
+        """
+        toolset = self._shared_toolset
+        if toolset is not None:
+            return toolset
+
+        with self._init_lock:
+            if self._shared_toolset is None:
+                key = self._desktop_commander_key()
+                self._shared_toolset = self.acquire(key)
+                self._shared_key = key
+                # Line limits are applied through the spawn environment (see _create_toolset).
+                logger.info("🔧 Shared MCP toolset has been created.")
+            return self._shared_toolset
+
+    async def aget_desktop_commander_toolset(self) -> Any:
+        """Async variant of get_desktop_commander_toolset for agent initialisation paths."""
+        toolset = self._shared_toolset
+        if toolset is not None:
+            return toolset
+
+        async with self._async_init_lock:
+            return self.get_desktop_commander_toolset()
+
     def set_desktop_commander_toolset(self, toolset: Any):
         """Set the shared toolset (used by main.py initialization)."""
-        if self._shared_toolset is not None:
-            logger.warning("⚠️ Toolset is being re-initialized.")
-        self._shared_toolset = toolset
+        with self._init_lock:
+            if self._shared_toolset is not None:
+                logger.warning("⚠️ Toolset is being re-initialized.")
+            self._shared_toolset = toolset
+            # Injected toolsets are owned by the caller, not the pool.
+            self._shared_key = None
+        # We did not spawn this server, so its limits cannot come from the environment.
         self._configure_high_throughput_limits()
         logger.info("🔧 Shared MCP toolset has been set.")
-    
+
+    def _desktop_commander_key(self) -> PoolKey:
+        """Pool key for the configured Desktop Commander server."""
+        return (config.DESKTOP_COMMANDER_COMMAND, tuple(config.DESKTOP_COMMANDER_ARGS), _PROJECT_ROOT)
+
+    def _create_toolset(self, key: PoolKey) -> Any:
+        """Build an MCP toolset for a pool key (the server starts on first use)."""
+        from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioConnectionParams
+        from mcp.client.stdio import StdioServerParameters
+
+        command, args, cwd = key
+        return MCPToolset(
+            connection_params=StdioConnectionParams(
+                server_params=StdioServerParameters(
+                    command=command,
+                    args=list(args),
+                    env=_mcp_env(),
+                    cwd=cwd
+                ),
+                timeout=config.MCP_TIMEOUT_SECONDS
+            )
+        )
+
     def _configure_high_throughput_limits(self):
-        """Configure high-throughput limits (2000/7000) for the Desktop Commander instance."""
+        """Configure high-throughput limits (2000/7000) for a Desktop Commander instance.
+
+        Only needed for toolsets injected via set_desktop_commander_toolset(); servers
+        spawned by the registry receive the limits in their environment.
+        """
         try:
             from .tool_config import apply_high_throughput_config
             logger.info("🚀 Configuring high-throughput limits for MCP instance...")
@@ -44,8 +173,32 @@ class ToolsetRegistry:
         except Exception as e:
             logger.error(f"⚠️  Error configuring limits: {e}")
             logger.warning("   Desktop Commander will use default limits")
+
+
+
+# Global registry instance, created on first use
+_registry_instance: Optional[ToolsetRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_toolset_registry() -> ToolsetRegistry:
+    """Get or create the global toolset registry instance.
     
+    Returns:
+        ToolsetRegistry instance
+    """
+    global _registry_instance
     
+    if _registry_instance is None:
+        with _registry_lock:
+            if _registry_instance is None:
+                _registry_instance = ToolsetRegistry()
+    
+    return _registry_instance
+
 
-# Global registry instance
-toolset_registry = ToolsetRegistry()
\ No newline at end of file
+def __getattr__(name: str) -> Any:
+    # Keep `from .toolset_registry import toolset_registry` working without building at import.
+    if name == "toolset_registry":
+        return get_toolset_registry()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
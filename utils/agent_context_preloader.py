@@ -6,8 +6,70 @@ Automatically loads required files for each agent type to eliminate manual file
 
 import os
 import glob
-from typing import Dict, Any, List, Optional, Tuple
+import fnmatch
+import functools
+import re
+import stat
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 from .. import config
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Load instruction prefixes mapped to the AgentContextPreloader method that handles them.
+_LOAD_INSTRUCTION_PREFIXES = (
+    ("auto_load:", "_load_single_file"),
+    ("auto_load_directory:", "_load_directory"),
+    ("auto_load_latest:", "_load_latest_file"),
+)
+
+# Placeholders understood by AgentContextPreloader._resolve_template_variables.
+_TEMPLATE_RE = re.compile(
+    r"\{(?:task_file_path|outputs_dir|artifact_to_validate|plan_artifact_name"
+    r"|implementation_manifest_artifact|task_id|validation_version"
+    r"|junior_critique_path|senior_critique_path)\}"
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_name_pattern(name_pattern: str) -> Callable[[str], Optional[re.Match]]:
+    """Compile a shell-style file name pattern to a regex match function."""
+    return re.compile(fnmatch.translate(name_pattern)).match
+
+
+def _pread_all(fd: int, length: int, offset: int) -> bytes:
+    """Read up to length bytes at offset, looping over short reads."""
+    chunks = []
+    while length > 0:
+        chunk = os.pread(fd, length, offset)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        length -= len(chunk)
+        offset += len(chunk)
+    return b"".join(chunks)
+
+
+def _decode_text(data: bytes, errors: str = 'strict') -> str:
+    """Decode UTF-8 with the newline translation text-mode open() would apply."""
+    text = data.decode('utf-8', errors=errors)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+# Shared pool for overlapping independent file reads; reads are I/O-bound so threads suffice.
+_IO_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ctxload")
+
+
+def _compile_load_instruction(instruction: str) -> Tuple[Optional[str], str]:
+    """Split a load instruction into (loader method name, path template)."""
+    for prefix, loader_name in _LOAD_INSTRUCTION_PREFIXES:
+        if instruction.startswith(prefix):
+            return loader_name, instruction[len(prefix):]
+    return None, instruction
 
 
 class AgentContextPreloader:
@@ -68,6 +130,26 @@ class AgentContextPreloader:
     MAX_FILE_SIZE_CHARS = 50000  # ~12-15k tokens for large files
     MAX_TOTAL_CONTEXT_CHARS = 200000  # ~50k tokens total context
     DIRECTORY_MAX_FILES = 10  # Max files to load from directory patterns
+
+    # Recently built contexts keyed by (agent_name, fingerprint of every source file)
+    _CTX_CACHE: "OrderedDict[tuple, Dict[str, str]]" = OrderedDict()
+    _CTX_CACHE_MAX = 8
+    _CTX_CACHE_LOCK = threading.Lock()
+
+    # Context maps split into (template_var, loader, path template), built once per agent
+    _COMPILED_CONTEXT_MAPS: Dict[str, List[Tuple[str, Optional[str], str]]] = {}
+
+    @classmethod
+    def _get_compiled_context_map(cls, agent_name: str) -> List[Tuple[str, Optional[str], str]]:
+        """Get the pre-parsed load instructions for an agent."""
+        compiled = cls._COMPILED_CONTEXT_MAPS.get(agent_name)
+        if compiled is None:
+            compiled = [
+                (template_var, *_compile_load_instruction(load_instruction))
+                for template_var, load_instruction in cls.AGENT_CONTEXT_MAPS[agent_name].items()
+            ]
+            cls._COMPILED_CONTEXT_MAPS[agent_name] = compiled
+        return compiled
     
     @classmethod
     def preload_context_for_agent(cls, agent_name: str, session_state: Dict[str, Any]) -> Dict[str, str]:
@@ -84,19 +166,42 @@ class AgentContextPreloader:
         if agent_name not in cls.AGENT_CONTEXT_MAPS:
             return {}
         
-        context_map = cls.AGENT_CONTEXT_MAPS[agent_name]
+        # Same values for every item of this agent, so build the map once
+        replacements = cls._build_replacements(session_state)
+        resolved_items = [
+            (template_var, loader_name, cls._resolve_template_variables(path_template, session_state, replacements))
+            for template_var, loader_name, path_template in cls._get_compiled_context_map(agent_name)
+        ]
+        
+        # Repeat runs of an agent over unchanged files reuse the previous result without reading anything
+        try:
+            cache_key = (agent_name, cls._fingerprint(resolved_items))
+        except Exception:
+            cache_key = None
+        if cache_key is not None:
+            with cls._CTX_CACHE_LOCK:
+                cached = cls._CTX_CACHE.get(cache_key)
+                if cached is not None:
+                    cls._CTX_CACHE.move_to_end(cache_key)
+                    logger.info("♻️ Reusing cached context for %s (%s items)", agent_name, len(cached))
+                    return dict(cached)
+        
         preloaded_context = {}
         total_chars = 0
         
-        print(f"\n📁 Pre-loading context for {agent_name}...")
+        logger.debug("📁 Pre-loading context for %s...", agent_name)
         
-        for template_var, load_instruction in context_map.items():
+        # Items load in declared order, so earlier entries in a context map take priority
+        for template_var, loader_name, resolved_path in resolved_items:
+            remaining = cls.MAX_TOTAL_CONTEXT_CHARS - total_chars
+            if remaining <= 0:
+                logger.debug("   ⚠️  Total context size limit reached (%s chars)", total_chars)
+                break
             try:
-                # Resolve template variables in the load instruction
-                resolved_instruction = cls._resolve_template_variables(load_instruction, session_state)
-                
                 # Load content based on instruction type
-                content = cls._execute_load_instruction(resolved_instruction)
+                # Cap each read at the remaining budget so oversized files are never fully read
+                max_bytes = min(remaining, cls.MAX_FILE_SIZE_CHARS * 2)
+                content = getattr(cls, loader_name)(resolved_path, max_bytes=max_bytes) if loader_name else ""
                 
                 if content:
                     # Truncate if too large
@@ -106,38 +211,56 @@ class AgentContextPreloader:
                     preloaded_context[template_var] = content
                     total_chars += len(content)
                     
-                    print(f"   ✅ {template_var}: {len(content)} chars loaded")
-                    
-                    # Check total context size
-                    if total_chars > cls.MAX_TOTAL_CONTEXT_CHARS:
-                        print(f"   ⚠️  Total context size limit reached ({total_chars} chars)")
-                        break
+                    logger.debug("   ✅ %s: %s chars loaded", template_var, len(content))
                 else:
-                    print(f"   ⚠️  {template_var}: No content found")
+                    logger.debug("   ⚠️  %s: No content found", template_var)
                     
             except Exception as e:
-                print(f"   ❌ {template_var}: Error loading - {str(e)}")
+                logger.warning("❌ %s context %s: Error loading - %s", agent_name, template_var, e)
                 # Continue with other context items even if one fails
                 continue
         
-        print(f"📊 Total context pre-loaded: {total_chars} chars ({len(preloaded_context)} items)")
+        logger.info("📊 Context pre-loaded for %s: %s chars (%s items)", agent_name, total_chars, len(preloaded_context))
+        
+        if cache_key is not None:
+            with cls._CTX_CACHE_LOCK:
+                cls._CTX_CACHE[cache_key] = dict(preloaded_context)
+                cls._CTX_CACHE.move_to_end(cache_key)
+                while len(cls._CTX_CACHE) > cls._CTX_CACHE_MAX:
+                    cls._CTX_CACHE.popitem(last=False)
         return preloaded_context
     
     @classmethod
-    def _resolve_template_variables(cls, instruction: str, session_state: Dict[str, Any]) -> str:
-        """Resolve template variables in load instructions using session state."""
-        from datetime import datetime
-        
+    def _fingerprint(cls, resolved_items: List[Tuple[str, Optional[str], str]]) -> tuple:
+        """Fingerprint the files behind an agent's context by (path, mtime, size).
+
+        Costs one stat per single-file item and one directory scan per pattern item,
+        but no file reads.
+        """
+        parts = []
+        for _, loader_name, path in resolved_items:
+            if loader_name == "_load_single_file":
+                try:
+                    st = os.stat(path)
+                    parts.append((path, st.st_mtime_ns, st.st_size))
+                except OSError:
+                    parts.append((path, None, None))
+            elif loader_name is not None:
+                parts.append((path, tuple(sorted(cls._iter_files(path)))))
+        return tuple(parts)
+    
+    @classmethod
+    def _build_replacements(cls, session_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the placeholder -> value map for a session state."""
         # Get variables from session state and config
         task_id = session_state.get("task_id") or config.TASK_ID
         outputs_dir = config.get_outputs_dir(task_id)
         
-        # Build replacement map
         # Handle nested validation and execution objects properly
         validation_obj = session_state.get("validation", {})
         execution_obj = session_state.get("execution", {})
         
-        replacements = {
+        return {
             "{task_file_path}": session_state.get("task_file_path", f"{config.TASKS_DIR}/{task_id}.md"),
             "{outputs_dir}": outputs_dir,
             "{artifact_to_validate}": validation_obj.get("artifact_to_validate", ""),
@@ -149,80 +272,140 @@ class AgentContextPreloader:
             "{junior_critique_path}": validation_obj.get("junior_critique_path", ""),
             "{senior_critique_path}": validation_obj.get("senior_critique_path", ""),
         }
-        
-        # Apply replacements
-        result = instruction
-        for placeholder, value in replacements.items():
-            if placeholder in result:
-                if value:
-                    result = result.replace(placeholder, str(value))
-                else:
-                    # Log missing state values but do not attempt to fall back.
-                    # This makes it clear that a state variable was expected but not provided.
-                    print(f"   🔍 Missing {placeholder.strip('{}')} in session state")
-                    print(f"   📋 Available keys: {list(session_state.keys())}")
-        
-        return result
     
     @classmethod
-    def _execute_load_instruction(cls, instruction: str) -> str:
-        """Execute a load instruction and return content."""
-        if instruction.startswith("auto_load:"):
-            file_path = instruction[10:]  # Remove "auto_load:" prefix
-            return cls._load_single_file(file_path)
-        
-        elif instruction.startswith("auto_load_directory:"):
-            dir_pattern = instruction[20:]  # Remove "auto_load_directory:" prefix
-            return cls._load_directory(dir_pattern)
+    def _resolve_template_variables(cls, instruction: str, session_state: Dict[str, Any],
+                                    replacements: Optional[Dict[str, Any]] = None) -> str:
+        """Resolve template variables in load instructions using session state.
+
+        Args:
+            instruction: Path template containing {placeholders}
+            session_state: Current session state
+            replacements: Map from _build_replacements(); built from session_state if omitted
+
+        Returns:
+            The instruction with every known, non-empty placeholder substituted
+        """
+        if replacements is None:
+            replacements = cls._build_replacements(session_state)
         
-        elif instruction.startswith("auto_load_latest:"):
-            file_pattern = instruction[17:]  # Remove "auto_load_latest:" prefix
-            return cls._load_latest_file(file_pattern)
+        def _substitute(match: re.Match) -> str:
+            placeholder = match.group(0)
+            value = replacements[placeholder]
+            if value:
+                return str(value)
+            # Log missing state values but do not attempt to fall back.
+            # This makes it clear that a state variable was expected but not provided.
+            logger.warning("🔍 Missing %s in session state", placeholder.strip('{}'))
+            logger.debug("📋 Available keys: %s", list(session_state.keys()))
+            return placeholder
         
-        else:
-            return ""
+        return _TEMPLATE_RE.sub(_substitute, instruction)
+    
+    @classmethod
+    def _iter_files(cls, pattern: str) -> Iterator[Tuple[str, float, int]]:
+        """Yield (path, mtime, size) for regular files matching a path pattern.
+
+        A pattern ending in '/' matches every file in that directory. Uses a single
+        os.scandir pass so is_file() and stat() come from the cached DirEntry.
+        """
+        parent, name_pattern = os.path.split(pattern)
+        if glob.has_magic(parent):
+            # Wildcards in the directory part span several directories; defer to glob.
+            for path in glob.glob(pattern):
+                st = os.stat(path)
+                if stat.S_ISREG(st.st_mode):
+                    yield path, st.st_mtime, st.st_size
+            return
+
+        match_name = _compile_name_pattern(name_pattern) if name_pattern else None
+        include_hidden = name_pattern.startswith('.')
+        try:
+            with os.scandir(parent or ".") as it:
+                for entry in it:
+                    if match_name is not None:
+                        # Mirror glob: wildcards do not match dotfiles unless asked to.
+                        if entry.name.startswith('.') and not include_hidden:
+                            continue
+                        if match_name(entry.name) is None:
+                            continue
+                    if entry.is_file():
+                        st = entry.stat()
+                        yield entry.path, st.st_mtime, st.st_size
+        except OSError:
+            return
     
     @classmethod
-    def _load_single_file(cls, file_path: str) -> str:
-        """Load content from a single file."""
-        if not file_path or not os.path.exists(file_path):
+    def _load_single_file(cls, file_path: str, max_bytes: Optional[int] = None) -> str:
+        """Load content from a single file.
+
+        Files larger than max_bytes (default: twice MAX_FILE_SIZE_CHARS) are not read
+        in full; only the head and tail are read, joined by a truncation notice.
+        """
+        if not file_path:
             return ""
         
+        if max_bytes is None:
+            max_bytes = cls.MAX_FILE_SIZE_CHARS * 2
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-            return content if content else ""
+            # Raw fd I/O: one open + fstat + pread, without the buffered text-file layers
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            return ""
+        try:
+            size = os.fstat(fd).st_size
+            if size <= max_bytes:
+                content = _decode_text(_pread_all(fd, size, 0)).strip()
+                return content if content else ""
+            
+            head_bytes = int(max_bytes * 0.8)
+            tail_bytes = int(max_bytes * 0.2)
+            head = _pread_all(fd, head_bytes, 0)
+            tail = _pread_all(fd, tail_bytes, size - tail_bytes)
+            # Byte offsets may split a multi-byte character at the cut points
+            return (
+                _decode_text(head, errors='ignore')
+                + f"\n\n... [TRUNCATED: {size - head_bytes - tail_bytes} bytes omitted from {os.path.basename(file_path)}] ...\n\n"
+                + _decode_text(tail, errors='ignore')
+            ).strip()
         except Exception:
             return ""
+        finally:
+            os.close(fd)
     
     @classmethod
-    def _load_directory(cls, dir_pattern: str) -> str:
-        """Load and combine content from all files matching directory pattern."""
+    def _load_directory(cls, dir_pattern: str, max_bytes: Optional[int] = None) -> str:
+        """Load and combine content from all files matching directory pattern.
+
+        Newest files are taken first; once their combined size reaches max_bytes
+        no further files are read.
+        """
         if not dir_pattern:
             return ""
         
-        # Handle both directory paths and glob patterns
-        if dir_pattern.endswith('/'):
-            # Directory path - list all files
-            if os.path.isdir(dir_pattern):
-                files = [os.path.join(dir_pattern, f) for f in os.listdir(dir_pattern) 
-                        if os.path.isfile(os.path.join(dir_pattern, f))]
-            else:
-                return ""
-        else:
-            # Glob pattern
-            files = glob.glob(dir_pattern)
-        
-        if not files:
+        # Handle both directory paths (trailing '/') and glob patterns
+        entries = list(cls._iter_files(dir_pattern))
+        if not entries:
             return ""
         
         # Sort by modification time (newest first) and limit count
-        files = sorted(files, key=lambda x: os.path.getmtime(x) if os.path.exists(x) else 0, reverse=True)
-        files = files[:cls.DIRECTORY_MAX_FILES]
+        entries.sort(key=lambda e: e[1], reverse=True)
+        files, budgets = [], []
+        remaining = max_bytes
+        for path, _, size in entries[:cls.DIRECTORY_MAX_FILES]:
+            if remaining is not None:
+                if remaining <= 0:
+                    break
+                budgets.append(min(remaining, cls.MAX_FILE_SIZE_CHARS * 2))
+                remaining -= size
+            else:
+                budgets.append(None)
+            files.append(path)
         
         combined_content = []
-        for file_path in files:
-            content = cls._load_single_file(file_path)
+        # Read concurrently; map() yields results in the sorted file order.
+        for file_path, content in zip(files, _IO_POOL.map(cls._load_single_file, files, budgets)):
             if content:
                 filename = os.path.basename(file_path)
                 combined_content.append(f"### {filename} ###\n{content}")
@@ -230,18 +413,16 @@ class AgentContextPreloader:
         return "\n\n".join(combined_content)
     
     @classmethod
-    def _load_latest_file(cls, file_pattern: str) -> str:
+    def _load_latest_file(cls, file_pattern: str, max_bytes: Optional[int] = None) -> str:
         """Load content from the most recent file matching the pattern."""
         if not file_pattern:
             return ""
         
-        files = glob.glob(file_pattern)
-        if not files:
+        # Single pass keeping only the newest match; no intermediate list
+        latest = max(cls._iter_files(file_pattern), key=lambda e: e[1], default=None)
+        if latest is None:
             return ""
-        
-        # Get the most recent file by modification time
-        latest_file = max(files, key=lambda x: os.path.getmtime(x) if os.path.exists(x) else 0)
-        return cls._load_single_file(latest_file)
+        return cls._load_single_file(latest[0], max_bytes)
     
     @classmethod
     def _truncate_content(cls, content: str, context_name: str) -> str:
@@ -250,18 +431,25 @@ class AgentContextPreloader:
             return content
         
         # For structured content, try to keep beginning and end
-        lines = content.split('\n')
-        if len(lines) > 20:
+        line_count = content.count('\n') + 1
+        if line_count > 20:
             # Keep first 60% and last 20% of lines with truncation notice
-            keep_start = int(len(lines) * 0.6)
-            keep_end = int(len(lines) * 0.2)
+            keep_start = int(line_count * 0.6)
+            keep_end = int(line_count * 0.2)
+            
+            # Locate the cut points with find/rfind and slice, rather than splitting into a list of lines
+            head_end = -1
+            for _ in range(keep_start):
+                head_end = content.find('\n', head_end + 1)
+            tail_start = len(content)
+            for _ in range(keep_end):
+                tail_start = content.rfind('\n', 0, tail_start)
             
-            truncated_lines = (
-                lines[:keep_start] +
-                [f"\n... [TRUNCATED: {len(lines) - keep_start - keep_end} lines omitted for {context_name}] ...\n"] +
-                lines[-keep_end:]
+            return (
+                content[:head_end]
+                + f"\n\n... [TRUNCATED: {line_count - keep_start - keep_end} lines omitted for {context_name}] ...\n\n"
+                + content[tail_start + 1:]
             )
-            return '\n'.join(truncated_lines)
         else:
             # Simple character truncation for short files
             truncate_point = cls.MAX_FILE_SIZE_CHARS - 200
@@ -4,31 +4,45 @@ from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import LlmResponse
 from .. import config
 from .workflow_errors import check_for_critical_errors, WorkflowError
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+_MARKER = config.END_OF_OUTPUT_MARKER
+# Enough trailing text to hold the marker plus ordinary trailing whitespace.
+_TAIL_LEN = len(_MARKER) + 64
+
+
+def _ends_with_marker(text: str) -> bool:
+    """Check for the end-of-output marker by inspecting only the tail of the text."""
+    tail = text[-_TAIL_LEN:].rstrip()
+    if len(tail) < len(_MARKER) and len(text) > _TAIL_LEN:
+        # Long trailing whitespace pushed the marker out of the tail; fall back to the full scan.
+        tail = text.rstrip()
+    return tail.endswith(_MARKER)
 
 def ensure_end_of_output(
     *, callback_context: CallbackContext, llm_response: LlmResponse
 ) -> Optional[LlmResponse]:
     """Checks if the model response ends with the required marker and detects workflow errors."""
     try:
-        text = None
-        agent_name = None
-        
-        # Try to get agent name from context
-        if hasattr(callback_context, 'agent_name'):
+        # Optimistic attribute access: one try/except is cheaper than a chain of hasattr calls
+        try:
             agent_name = callback_context.agent_name
-        elif hasattr(callback_context, 'metadata') and isinstance(callback_context.metadata, dict):
-            agent_name = callback_context.metadata.get('agent_name')
+        except AttributeError:
+            metadata = getattr(callback_context, 'metadata', None)
+            agent_name = metadata.get('agent_name') if isinstance(metadata, dict) else None
         
         # Handle Gemini response structure
-        if hasattr(llm_response, 'candidates') and llm_response.candidates:
-            candidate = llm_response.candidates[0]
-            if hasattr(candidate, 'content') and candidate.content:
-                if hasattr(candidate.content, 'parts') and candidate.content.parts:
-                    # Standard structure
-                    text = candidate.content.parts[0].text
-                elif hasattr(candidate.content, 'text'):
-                    # Alternative structure
-                    text = candidate.content.text
+        try:
+            # Standard structure
+            text = llm_response.candidates[0].content.parts[0].text
+        except (AttributeError, IndexError, TypeError):
+            try:
+                # Alternative structure
+                text = llm_response.candidates[0].content.text
+            except (AttributeError, IndexError, TypeError):
+                text = None
         
         if text:
             # Check for workflow errors first (this may raise exception)
@@ -36,27 +50,24 @@ def ensure_end_of_output(
                 check_for_critical_errors(text, agent_name=agent_name, stop_on_critical=True)
             except WorkflowError as e:
                 # Log the critical error and re-raise to stop the workflow
-                print(f"\n{'='*60}")
-                print(f"🚨 CRITICAL WORKFLOW ERROR DETECTED")
-                print(f"{'='*60}")
-                print(f"Agent: {agent_name or 'Unknown'}")
-                print(f"Error: {e.message}")
-                print(f"{'='*60}\n")
+                logger.error(
+                    "🚨 CRITICAL WORKFLOW ERROR DETECTED - Agent: %s - Error: %s", agent_name or 'Unknown', e.message
+                )
                 raise  # Re-raise to stop the workflow
             
             # Check for end of output marker
-            if not text.strip().endswith(config.END_OF_OUTPUT_MARKER):
-                print(f"WARNING: Output from model did not contain the required marker. Retrying may be necessary.")
-                print(f"Output preview: {text[:100]}...")
+            if not _ends_with_marker(text):
+                logger.warning("⚠️ Output from model did not contain the required marker. Retrying may be necessary.")
+                logger.debug("Output preview: %s...", text[:100])
                 # In a production system, you might want to return a new LlmResponse
                 # to force a retry or signal a failure.
     except WorkflowError:
         # Re-raise workflow errors to stop the pipeline
         raise
     except Exception as e:
-        print(f"WARNING: Error in callback processing response: {e}")
+        logger.warning("⚠️ Error in callback processing response: %s", e)
         # Log the response structure for debugging
-        print(f"Response type: {type(llm_response)}")
+        logger.debug("Response type: %s", type(llm_response))
         if hasattr(llm_response, 'candidates'):
-            print(f"Has candidates: {bool(llm_response.candidates)}")
+            logger.debug("Has candidates: %s", bool(llm_response.candidates))
     return None # Allow the response to proceed
\ No newline at end of file
@@ -9,23 +9,933 @@ This manager handles:
 - Providing a clean interface for agents to manage long-running, fallible tasks.
 """
 import os
-import json
-import shutil
+import re
+import pickle
+import struct
+import errno
+import fnmatch
+import hashlib
+import atexit
+import queue
+import threading
 import time
+import mmap
+import shutil
+import tarfile
+import zipfile
+import zlib
 from datetime import datetime, timezone
-from typing import Dict, Any, List, Optional, Union
-from pathlib import Path
-from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, fields
 from contextlib import contextmanager
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from pydantic_core import PydanticSerializationError
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import ctypes
+    _libc_syncfs = ctypes.CDLL(None, use_errno=True).syncfs
+except (ImportError, OSError, AttributeError):
+    _libc_syncfs = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 from .. import config
 from .state_model import DOMISessionState
 from .logger import get_logger
+from .fastjson import dumps, loads
 
 logger = get_logger(__name__)
 
+# Per-snapshot record of {relative path: [size, mtime_ns]} written by incremental snapshots.
+_MANIFEST_NAME = "outputs_manifest.json"
+# Per-snapshot {"files": {relative path: [size, mtime_ns, digest]}, "dirs": [...]} of content mode
+_CONTENT_MANIFEST_NAME = "outputs_content.json"
+# ioctl request from linux/fs.h that makes one file share another's extents
+_FICLONE = 0x40049409
+# (source st_dev, destination st_dev) pairs on which FICLONE failed
+_NO_REFLINK_DEVICES = set()
+# (source st_dev, destination st_dev) pairs on which copy_file_range failed
+_NO_COPY_RANGE_DEVICES = set()
+# File in the checkpoints dir holding the name of the newest snapshot
+_LATEST_SNAPSHOT_POINTER = "latest_snapshot"
+_STATE_JSON = "domi_state.json"
+_STATE_MSGPACK = "domi_state.msgpack"
+_STATE_PICKLE = "domi_state.pickle"
+# Out-of-band buffers of a pickled state: a little-endian uint64 count, one uint64 length
+# per buffer, then the raw buffer contents back to back
+_STATE_PICKLE_BUFFERS = "domi_state.pickle.buffers"
+_ZSTD_SUFFIX = ".zst"
+# Probed in this order when loading, so a snapshot in any of these encodings restores
+_STATE_FILE_NAMES = (
+    _STATE_JSON, _STATE_JSON + _ZSTD_SUFFIX, _STATE_MSGPACK, _STATE_MSGPACK + _ZSTD_SUFFIX,
+)
+# Only probed when STATE_SNAPSHOT_FORMAT is "pickle": unpickling can run arbitrary code
+_PICKLE_STATE_FILE_NAMES = (_STATE_PICKLE, _STATE_PICKLE + _ZSTD_SUFFIX)
+# Live operation files; completed ones are renamed to operation_<id>.done.json
+_OPERATION_FILE_RE = re.compile(r"^operation_.+(?<!\.done)\.json$")
+# Fixed-width UTC timestamp for snapshot names, e.g. 20250101T120000123456Z; sorts chronologically
+_SNAPSHOT_TS_FORMAT = "%Y%m%dT%H%M%S%fZ"
+# Makes ISO timestamps safe for use in file and checkpoint names
+_DASH_TRANS = str.maketrans({":": "-", ".": "-"})
+# Fallback warnings already logged by this process
+_WARNED_FALLBACKS = set()
+
+
+# fdatasync skips the metadata flush fsync does; not every platform provides it
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+# Longest a written step-log entry may wait for fdatasync in the background writer
+_LOG_SYNC_SECONDS = 0.05
+# Lines handed to a single writev() call, kept below the usual IOV_MAX of 1024
+_LOG_WRITEV_BATCH = 512
+# Kinds of work queued for the background checkpoint writer
+_QUEUED_LOG_LINE = "log_line"
+_QUEUED_OPERATION_FILE = "operation_file"
+_QUEUED_FLUSH = "flush"
+
+
+def _atomic_write_bytes(path: str, data, sync: bool = True):
+    """Write a file via a temp file and os.replace, so readers never see a partial write.
+
+    Args:
+        path: Destination file
+        data: Full file contents, as one bytes-like object or a list of them written in order
+        sync: fdatasync the temp file before the rename; pass False when the caller
+            makes the whole batch durable with _syncfs afterwards
+    """
+    tmp_path = f"{path}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        for chunk in (data if isinstance(data, list) else (data,)):
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(fd, view):]
+        if sync:
+            _fdatasync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def _fdatasync_file(path: str):
+    """fdatasync a file that has already been written and closed."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        _fdatasync(fd)
+    finally:
+        os.close(fd)
+
+
+def _syncfs(path: str):
+    """Make everything just written under the directory path durable.
+
+    Uses Linux syncfs(2) through libc (Python does not wrap it), which flushes the
+    filesystem holding path in one call. Where it is unavailable, every file under
+    path is fdatasynced and every directory fsynced instead, rather than falling
+    back to os.sync() and flushing every mounted filesystem.
+    """
+    if _libc_syncfs is not None:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            if _libc_syncfs(fd) == 0:
+                return
+        finally:
+            os.close(fd)
+    for dirpath, _dirnames, filenames in os.walk(path):
+        for name in filenames:
+            _fdatasync_file(os.path.join(dirpath, name))
+        try:
+            _fdatasync_file(dirpath)
+        except OSError:
+            pass  # Some platforms cannot fsync a directory
+
+
+# Runs the state write of a snapshot alongside the outputs copy
+_SNAPSHOT_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="domi-snapshot")
+# Writes whole snapshots in the background when ASYNC_STATE_SNAPSHOTS is on. Work already
+# submitted is finished at interpreter exit, which joins executor threads.
+_ASYNC_SNAPSHOT_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="domi-snapshot-writer")
+
+
+class _CheckpointWriter:
+    """Process-wide write-behind writer for step logs and operation files.
+
+    One daemon thread serves every CheckpointManager. Queued entries carry absolute
+    target paths, so nothing a manager does after queueing (such as switching task)
+    redirects a write, and no manager is kept alive by the writer or by atexit.
+    """
+
+    def __init__(self):
+        # Queue of (kind, path, payload): step-log lines, encoded operation files, and
+        # flush requests whose threading.Event is set once everything before it is synced
+        self._queue: "queue.SimpleQueue[Tuple[str, Optional[str], Any]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        # Open append-mode descriptors of step logs by path
+        self._log_fds: Dict[str, int] = {}
+        self._log_fds_lock = threading.Lock()
+
+    def append_line(self, log_path: str, line: bytes):
+        """Queue one encoded line for appending to a step log."""
+        self._ensure_started()
+        self._queue.put((_QUEUED_LOG_LINE, log_path, line))
+
+    def write_file(self, path: str, data: List[bytes]):
+        """Queue an atomic rewrite of a file; of several queued for one path only the newest is written."""
+        self._ensure_started()
+        self._queue.put((_QUEUED_OPERATION_FILE, path, data))
+
+    def flush(self):
+        """Block until every queued write is written and synced."""
+        thread = self._thread
+        if thread is None:
+            return
+        done = threading.Event()
+        self._queue.put((_QUEUED_FLUSH, None, done))
+        while not done.wait(_LOG_SYNC_SECONDS):
+            if not thread.is_alive():
+                logger.error("❌ Checkpoint writer thread is gone; queued checkpoint writes were not flushed")
+                return
+
+    def close_logs(self, log_paths: List[str]):
+        """Flush, then close the descriptors of the given step logs."""
+        self.flush()
+        with self._log_fds_lock:
+            fds = [self._log_fds.pop(path) for path in log_paths if path in self._log_fds]
+        for fd in fds:
+            os.close(fd)
+
+    def _ensure_started(self):
+        """Start the writer thread on first use."""
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._drain, name="domi-checkpoint-log", daemon=True)
+                thread.start()
+                atexit.register(self.flush)
+                self._thread = thread
+
+    def _log_fd(self, log_path: str) -> int:
+        """Get the O_APPEND descriptor of a step log, opening it if needed."""
+        with self._log_fds_lock:
+            fd = self._log_fds.get(log_path)
+            if fd is None:
+                fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                self._log_fds[log_path] = fd
+            return fd
+
+    def _drain(self):
+        """Background loop writing queued step-log lines and operation files.
+
+        Lines are grouped per log and appended with one writev() per batch.
+        Written logs are fdatasynced at most every _LOG_SYNC_SECONDS, and always
+        before a flush() waiter is released. Of several rewrites of one operation
+        file in a batch only the newest is written.
+        """
+        dirty = set()
+        last_sync = time.monotonic()
+        while True:
+            batch = []
+            try:
+                # Idle writers block indefinitely; unsynced data bounds the wait instead
+                batch.append(self._queue.get(timeout=_LOG_SYNC_SECONDS if dirty else None))
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            pending: Dict[str, List[bytes]] = {}
+            operation_files: Dict[str, List[bytes]] = {}
+            waiters = []
+            for kind, path, payload in batch:
+                if kind == _QUEUED_LOG_LINE:
+                    pending.setdefault(path, []).append(payload)
+                elif kind == _QUEUED_OPERATION_FILE:
+                    operation_files[path] = payload
+                else:
+                    waiters.append(payload)
+
+            try:
+                for log_path, lines in pending.items():
+                    try:
+                        fd = self._log_fd(log_path)
+                        for start in range(0, len(lines), _LOG_WRITEV_BATCH):
+                            os.writev(fd, lines[start:start + _LOG_WRITEV_BATCH])
+                        dirty.add(log_path)
+                    except OSError as e:
+                        logger.error("❌ Failed to write step log %s: %s", log_path, e)
+
+                for path, data in operation_files.items():
+                    try:
+                        _atomic_write_bytes(path, data)
+                    except OSError as e:
+                        logger.error("❌ Failed to write operation progress %s: %s", path, e)
+
+                now = time.monotonic()
+                if dirty and (waiters or now - last_sync >= _LOG_SYNC_SECONDS):
+                    with self._log_fds_lock:
+                        for log_path in dirty:
+                            fd = self._log_fds.get(log_path)
+                            if fd is not None:
+                                _fdatasync(fd)
+                    dirty.clear()
+                    last_sync = now
+            except Exception as e:
+                # A dead writer would leave every flush() waiting forever
+                logger.error("❌ Checkpoint writer failed on a batch: %s", e)
+            finally:
+                for event in waiters:
+                    event.set()
+
+
+_CHECKPOINT_WRITER = _CheckpointWriter()
+
+
+def _serialize_state(state: DOMISessionState) -> bytes:
+    """Serialize session state to JSON bytes.
+
+    pydantic's model_dump_json encodes the model in one pass without building an
+    intermediate dict. Only when that rejects a value (e.g. an object stored in
+    metadata) do we fall back to model_dump() plus dumps, which stringifies it.
+    """
+    try:
+        return state.model_dump_json(indent=2).encode("utf-8")
+    except PydanticSerializationError as e:
+        logger.debug("State has values JSON cannot encode, storing them as strings: %s", e)
+        return dumps(state.model_dump())
+
+
+def _pickle_state(state: DOMISessionState) -> Tuple[bytes, List[Any]]:
+    """Pickle the state dict with protocol 5, keeping large buffers out of the stream.
+
+    Objects supporting out-of-band pickling (numpy arrays, pickle.PickleBuffer) hand
+    their memory to the buffer callback instead of being copied into the pickle.
+
+    Returns:
+        (pickle stream, header plus raw buffers to write to the sidecar file)
+    """
+    buffers = []
+    data = pickle.dumps(state.model_dump(), protocol=5, buffer_callback=buffers.append)
+    if not buffers:
+        return data, []
+    raws = [buffer.raw() for buffer in buffers]
+    header = struct.pack(f"<{len(raws) + 1}Q", len(raws), *(raw.nbytes for raw in raws))
+    return data, [header, *raws]
+
+
+def _read_pickle_buffers(path: str) -> List[memoryview]:
+    """Read the out-of-band buffers written next to a pickled state."""
+    with open(path, 'rb') as f:
+        # Mutable, so arrays rebuilt on top of it stay writable
+        blob = bytearray(f.read())
+    view = memoryview(blob)
+    (count,) = struct.unpack_from("<Q", view)
+    lengths = struct.unpack_from(f"<{count}Q", view, 8)
+    buffers, offset = [], 8 * (count + 1)
+    for length in lengths:
+        buffers.append(view[offset:offset + length])
+        offset += length
+    return buffers
+
+
+def _warn_fallback_once(message: str):
+    """Log a missing-optional-package fallback the first time it happens in this process."""
+    if message not in _WARNED_FALLBACKS:
+        _WARNED_FALLBACKS.add(message)
+        logger.warning(message)
+
+
+def _encode_state(state: DOMISessionState) -> List[Tuple[str, Any]]:
+    """Encode session state per STATE_SNAPSHOT_FORMAT and SNAPSHOT_COMPRESSION.
+
+    Returns:
+        (file name inside the snapshot directory, bytes or list of byte chunks) for each
+        file to write; only pickled states with out-of-band buffers need a second file
+    """
+    name, data, sidecar = _STATE_JSON, None, []
+    if config.STATE_SNAPSHOT_FORMAT == "pickle":
+        name = _STATE_PICKLE
+        data, sidecar = _pickle_state(state)
+    elif config.STATE_SNAPSHOT_FORMAT == "msgpack":
+        if msgpack is not None:
+            name, data = _STATE_MSGPACK, msgpack.packb(state.model_dump(), default=str, use_bin_type=True)
+        else:
+            _warn_fallback_once("⚠️  STATE_SNAPSHOT_FORMAT is msgpack but msgpack is not installed; using JSON")
+    if data is None:
+        data = _serialize_state(state)
+
+    # Only the main stream is compressed; out-of-band buffers are written as they are
+    if config.SNAPSHOT_COMPRESSION == "zstd":
+        if zstandard is not None:
+            name, data = name + _ZSTD_SUFFIX, zstandard.ZstdCompressor(level=3).compress(data)
+        else:
+            _warn_fallback_once("⚠️  SNAPSHOT_COMPRESSION is zstd but zstandard is not installed; writing uncompressed")
+    files = [(name, data)]
+    if sidecar:
+        files.append((_STATE_PICKLE_BUFFERS, sidecar))
+    return files
+
+
+def _write_state_files(snapshot_dir: str, state_files: List[Tuple[str, Any]]):
+    """Write the files produced by _encode_state; the caller makes them durable with _syncfs."""
+    for name, data in state_files:
+        _atomic_write_bytes(os.path.join(snapshot_dir, name), data, sync=False)
+
+
+def _load_state_file(snapshot_dir: str) -> Optional[Dict[str, Any]]:
+    """Read the session state dict of a snapshot in whichever format it was saved.
+
+    Pickled state is only loaded when STATE_SNAPSHOT_FORMAT is "pickle".
+    """
+    allow_pickle = config.STATE_SNAPSHOT_FORMAT == "pickle"
+    for name in (_PICKLE_STATE_FILE_NAMES + _STATE_FILE_NAMES) if allow_pickle else _STATE_FILE_NAMES:
+        path = os.path.join(snapshot_dir, name)
+        if not os.path.exists(path):
+            continue
+        is_msgpack = name.startswith(_STATE_MSGPACK)
+        is_pickle = name.startswith(_STATE_PICKLE)
+        compressed = name.endswith(_ZSTD_SUFFIX)
+        if is_msgpack and msgpack is None:
+            raise RuntimeError(f"Snapshot state {path} needs the msgpack package to load")
+        if compressed and zstandard is None:
+            raise RuntimeError(f"Snapshot state {path} needs the zstandard package to load")
+        if not (is_msgpack or is_pickle or compressed):
+            return _load_json_mapped(path)
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        if compressed:
+            data = zstandard.ZstdDecompressor().decompress(data)
+        if is_pickle:
+            buffers_path = os.path.join(snapshot_dir, _STATE_PICKLE_BUFFERS)
+            buffers = _read_pickle_buffers(buffers_path) if os.path.exists(buffers_path) else ()
+            return pickle.loads(data, buffers=buffers)
+        return msgpack.unpackb(data, raw=False) if is_msgpack else loads(data)
+    if not allow_pickle and any(os.path.exists(os.path.join(snapshot_dir, name)) for name in _PICKLE_STATE_FILE_NAMES):
+        raise RuntimeError(
+            f"Snapshot state in {snapshot_dir} is pickled; set STATE_SNAPSHOT_FORMAT=pickle to load it"
+        )
+    return None
+
+
+def _replay_step_log(progress: Dict[str, Any], log_path: str) -> Dict[str, Any]:
+    """Apply the completed/failed events of an operation's step log to its progress dict.
+
+    The operation file is only rewritten every few step events, so the progress it holds
+    can trail the log. Replaying an event twice is harmless; operation_state is only taken
+    from entries newer than the file's own updated_at. A torn final line left by a crash
+    is skipped.
+    """
+    try:
+        with open(log_path, 'rb') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return progress
+
+    compacted_at = progress.get("updated_at") or ""
+    steps_by_phase = {"completed": progress["completed_steps"], "failed": progress["failed_steps"]}
+    seen = {phase: set(step_ids) for phase, step_ids in steps_by_phase.items()}
+    for line in lines:
+        try:
+            entry = loads(line)
+        except ValueError:
+            continue
+        phase = entry.get("phase")
+        if phase in steps_by_phase and entry["step_id"] not in seen[phase]:
+            steps_by_phase[phase].append(entry["step_id"])
+            seen[phase].add(entry["step_id"])
+        if entry.get("timestamp", "") > compacted_at:
+            if phase in steps_by_phase:
+                progress["updated_at"] = entry["timestamp"]
+            if "operation_state" in entry:
+                progress["operation_state"] = entry["operation_state"]
+    return progress
+
+
+def _utcnow_iso() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _copy_file(src: str, dst: str):
+    """Copy a file with its metadata, keeping the data inside the kernel where possible.
+
+    Tries, in order: a reflink (FICLONE on btrfs, XFS, bcachefs...), which shares the
+    source's blocks copy-on-write so later edits to either file stay private; then
+    copy_file_range, which copies in-kernel (and server-side on NFS/SMB); then a plain
+    buffered copy. Device pairs where a method failed skip straight past it next time.
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+        devices = (os.fstat(in_fd).st_dev, os.fstat(out_fd).st_dev)
+        copied = False
+        if fcntl is not None and devices not in _NO_REFLINK_DEVICES:
+            try:
+                fcntl.ioctl(out_fd, _FICLONE, in_fd)
+                copied = True
+            except OSError:
+                _NO_REFLINK_DEVICES.add(devices)
+        if not copied and hasattr(os, "copy_file_range") and devices not in _NO_COPY_RANGE_DEVICES:
+            try:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(in_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                while os.copy_file_range(in_fd, out_fd, 1 << 30):
+                    pass
+                copied = True
+            except OSError:
+                _NO_COPY_RANGE_DEVICES.add(devices)
+                os.lseek(in_fd, 0, os.SEEK_SET)
+                os.lseek(out_fd, 0, os.SEEK_SET)
+                os.ftruncate(out_fd, 0)
+        if not copied:
+            shutil.copyfileobj(fsrc, fdst, 1 << 20)
+    shutil.copystat(src, dst)
+
+
+@lru_cache(maxsize=8)
+def _compile_exclude_patterns(patterns: Tuple[str, ...]):
+    """Compile shell-style patterns into a single regex match function."""
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns)).match
+
+
+def _is_excluded(rel: str) -> bool:
+    """Whether an outputs path (relative to the outputs root) or one of its parent
+    directories matches SNAPSHOT_EXCLUDE_PATTERNS."""
+    patterns = config.SNAPSHOT_EXCLUDE_PATTERNS
+    if not patterns:
+        return False
+    match = _compile_exclude_patterns(tuple(patterns))
+    parts = rel.split(os.sep)
+    for depth in range(len(parts), 0, -1):
+        if match("/".join(parts[:depth])) is not None or match(parts[depth - 1]) is not None:
+            return True
+    return False
+
+
+def _walk_included(root: str):
+    """os.walk over root yielding (dirpath, rel_dir, dirnames, filenames) minus excluded paths.
+
+    Excluded directories are pruned from the walk, so their subtrees are never visited.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root)
+        if config.SNAPSHOT_EXCLUDE_PATTERNS:
+            dirnames[:] = [name for name in dirnames if not _is_excluded(os.path.normpath(os.path.join(rel_dir, name)))]
+            filenames = [name for name in filenames if not _is_excluded(os.path.normpath(os.path.join(rel_dir, name)))]
+        yield dirpath, rel_dir, dirnames, filenames
+
+
+def _clone_tree(src: str, dst: str):
+    """Mirror a directory tree with private copies of its files.
+
+    Each file goes through _copy_file, so it is a reflink where the filesystem supports
+    one and a copy otherwise. Hard links are not used: output files are edited in place
+    (Desktop Commander truncates and rewrites them), which would rewrite a linked copy too.
+    """
+    for root, rel, _, files in _walk_included(src):
+        target_root = dst if rel == os.curdir else os.path.join(dst, rel)
+        os.makedirs(target_root, exist_ok=True)
+        for name in files:
+            _copy_file(os.path.join(root, name), os.path.join(target_root, name))
+
+
+def _scan_tree(root: str) -> Tuple[Dict[str, Tuple[int, int]], List[str]]:
+    """Map each file under root to (size, mtime_ns) and list its directories, both by relative path."""
+    files, dirs = {}, []
+    for dirpath, rel_dir, dirnames, filenames in _walk_included(root):
+        for name in dirnames:
+            dirs.append(os.path.normpath(os.path.join(rel_dir, name)))
+        for name in filenames:
+            st = os.stat(os.path.join(dirpath, name))
+            files[os.path.normpath(os.path.join(rel_dir, name))] = (st.st_size, st.st_mtime_ns)
+    return files, dirs
+
+
+def _save_incremental_snapshot(outputs_dir: str, snapshot_dir: str, previous_snapshot_dir: Optional[str]):
+    """Copy outputs into a snapshot, hard-linking files unchanged since the previous one.
+
+    Links only ever point at the previous snapshot's private copies, never
+    at live outputs, so later edits to outputs cannot alter a saved snapshot.
+
+    Returns:
+        (files copied, files linked)
+    """
+    previous_manifest = {}
+    if previous_snapshot_dir:
+        try:
+            with open(os.path.join(previous_snapshot_dir, _MANIFEST_NAME), 'rb') as f:
+                previous_manifest = loads(f.read())
+        except (OSError, ValueError):
+            previous_manifest = {}
+    previous_root = os.path.join(previous_snapshot_dir or "", "outputs_snapshot")
+    snapshot_root = os.path.join(snapshot_dir, "outputs_snapshot")
+
+    files, dirs = _scan_tree(outputs_dir)
+    os.makedirs(snapshot_root, exist_ok=True)
+    for rel in dirs:
+        os.makedirs(os.path.join(snapshot_root, rel), exist_ok=True)
+
+    copied = linked = 0
+    manifest = {}
+    for rel, (size, mtime_ns) in files.items():
+        dst = os.path.join(snapshot_root, rel)
+        manifest[rel] = [size, mtime_ns]
+        if previous_manifest.get(rel) == [size, mtime_ns]:
+            try:
+                os.link(os.path.join(previous_root, rel), dst)
+                linked += 1
+                continue
+            except OSError:
+                pass
+        # _copy_file keeps mtime_ns, so the next snapshot can compare against this one
+        _copy_file(os.path.join(outputs_dir, rel), dst)
+        copied += 1
+
+    # Written last: a snapshot without a manifest is never used as a link source
+    _atomic_write_bytes(os.path.join(snapshot_dir, _MANIFEST_NAME), dumps(manifest, indent=False), sync=False)
+    return copied, linked
+
+
+def _prune_tree(root: str, keep_files: set, keep_dirs: set):
+    """Delete files and directories under root whose relative paths are not in the keep sets.
+
+    Paths matching SNAPSHOT_EXCLUDE_PATTERNS were never snapshotted, so they are left
+    in place along with the directories holding them.
+    """
+    # Directories that must survive because something excluded lives inside them
+    holding = set()
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        rel_dir = os.path.normpath(os.path.relpath(dirpath, root))
+        for name in filenames:
+            rel = os.path.normpath(os.path.join(rel_dir, name))
+            if rel in keep_files:
+                continue
+            if _is_excluded(rel):
+                holding.add(rel_dir)
+                continue
+            os.remove(os.path.join(dirpath, name))
+        for name in dirnames:
+            path = os.path.join(dirpath, name)
+            rel = os.path.normpath(os.path.join(rel_dir, name))
+            if rel in holding or _is_excluded(rel):
+                holding.add(rel_dir)
+            elif rel not in keep_dirs and not os.path.islink(path):
+                shutil.rmtree(path)
+
 
-@dataclass
+def _sync_tree(src: str, dst: str):
+    """Make dst a copy of src, copying only files whose size or mtime differ."""
+    src_files, src_dirs = _scan_tree(src)
+    os.makedirs(dst, exist_ok=True)
+    dst_files, _ = _scan_tree(dst)
+    for rel in src_dirs:
+        os.makedirs(os.path.join(dst, rel), exist_ok=True)
+    for rel, meta in src_files.items():
+        if dst_files.get(rel) != meta:
+            _copy_file(os.path.join(src, rel), os.path.join(dst, rel))
+    _prune_tree(dst, set(src_files), set(src_dirs))
+
+
+def _reuse_outputs_snapshot(previous_snapshot_dir: str, snapshot_dir: str):
+    """Give a snapshot the outputs copy of an earlier one, in whatever form it was saved.
+
+    Files (zip archive, manifests) are hard-linked and directories are symlinked by
+    relative path; snapshot contents are never modified, so sharing them is safe.
+    """
+    # scandir's d_type answers is_dir() for plain entries without a stat per file
+    with os.scandir(previous_snapshot_dir) as it:
+        for entry in it:
+            if (entry.name in _STATE_FILE_NAMES or entry.name in _PICKLE_STATE_FILE_NAMES
+                    or entry.name == _STATE_PICKLE_BUFFERS):
+                continue
+            src = os.path.realpath(entry.path)
+            dst = os.path.join(snapshot_dir, entry.name)
+            if entry.is_dir():
+                os.symlink(os.path.relpath(src, snapshot_dir), dst)
+            else:
+                try:
+                    os.link(src, dst)
+                except OSError:
+                    _copy_file(src, dst)
+
+
+def _hash_file(path: str) -> str:
+    """BLAKE2b hex digest of a file's contents."""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "blake2b").hexdigest()
+        digest = hashlib.blake2b()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def _object_path(objects_dir: str, digest: str) -> str:
+    return os.path.join(objects_dir, digest[:2], digest)
+
+
+def _save_content_snapshot(outputs_dir: str, snapshot_dir: str, objects_dir: str,
+                           previous_snapshot_dir: Optional[str]):
+    """Record outputs as a manifest of content hashes, storing each distinct blob once.
+
+    Blobs live in a task-wide store (objects/<xx>/<digest>) shared by all snapshots,
+    so identical files are kept once no matter which snapshot or path they came from.
+    Files whose size and mtime match the previous manifest reuse its digest unhashed.
+
+    Returns:
+        (blobs stored, files already in the store)
+    """
+    previous = {}
+    if previous_snapshot_dir:
+        try:
+            previous = _load_json_mapped(os.path.join(previous_snapshot_dir, _CONTENT_MANIFEST_NAME))["files"]
+        except (OSError, ValueError, KeyError):
+            previous = {}
+
+    files, dirs = _scan_tree(outputs_dir)
+    stored = reused = 0
+    entries = {}
+    for rel, (size, mtime_ns) in files.items():
+        src = os.path.join(outputs_dir, rel)
+        prev = previous.get(rel)
+        digest = prev[2] if prev is not None and prev[:2] == [size, mtime_ns] else _hash_file(src)
+        obj = _object_path(objects_dir, digest)
+        if os.path.exists(obj):
+            reused += 1
+        else:
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            _copy_file(src, f"{obj}.tmp")
+            if _libc_syncfs is None:
+                # Blobs live outside the snapshot directory that _syncfs falls back to walking
+                _fdatasync_file(f"{obj}.tmp")
+            os.replace(f"{obj}.tmp", obj)
+            stored += 1
+        entries[rel] = [size, mtime_ns, digest]
+
+    _atomic_write_bytes(os.path.join(snapshot_dir, _CONTENT_MANIFEST_NAME),
+                        dumps({"files": entries, "dirs": dirs}, indent=False), sync=False)
+    return stored, reused
+
+
+def _restore_content_snapshot(manifest_path: str, objects_dir: str, outputs_dir: str):
+    """Make outputs_dir match a content manifest, copying only files whose size or mtime differ."""
+    manifest = _load_json_mapped(manifest_path)
+    os.makedirs(outputs_dir, exist_ok=True)
+    current, _ = _scan_tree(outputs_dir)
+    for rel in manifest["dirs"]:
+        os.makedirs(os.path.join(outputs_dir, rel), exist_ok=True)
+    for rel, (size, mtime_ns, digest) in manifest["files"].items():
+        if current.get(rel) == (size, mtime_ns):
+            continue
+        dst = os.path.join(outputs_dir, rel)
+        _copy_file(_object_path(objects_dir, digest), dst)
+        # A shared blob carries the mtime of whichever file stored it first
+        os.utime(dst, ns=(mtime_ns, mtime_ns))
+    _prune_tree(outputs_dir, set(manifest["files"]), set(manifest["dirs"]))
+
+
+def _load_json_mapped(path: str) -> Any:
+    """Parse a JSON file straight from a read-only mmap, without an intermediate read() copy."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return loads(b"")  # mmap rejects empty files; let the parser raise as usual
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return loads(view)
+
+
+def _zip_store(src_dir: str, dst_zip: str):
+    """Archive a directory tree into an uncompressed (ZIP_STORED) zip.
+
+    Outputs are mostly text the snapshot only needs to preserve, so deflating them
+    costs more CPU than the disk it saves; stored members are a straight copy.
+    """
+    with zipfile.ZipFile(dst_zip, 'w', compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for dirpath, _, dirnames, filenames in _walk_included(src_dir):
+            dirnames.sort()
+            for name in dirnames:
+                path = os.path.join(dirpath, name)
+                zf.write(path, os.path.relpath(path, src_dir))
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                info = zipfile.ZipInfo.from_file(path, os.path.relpath(path, src_dir))
+                with open(path, 'rb') as src, zf.open(info, 'w', force_zip64=True) as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+
+
+def _tar_store(src_dir: str, dst_base: str) -> str:
+    """Stream a directory tree into a single tar file, zstd-compressed when configured.
+
+    The archive is written front to back through one file descriptor, so a tree of
+    many small files becomes one sequential write.
+
+    Returns:
+        Path of the archive written (dst_base plus ".tar" or ".tar.zst")
+    """
+    compress = config.SNAPSHOT_COMPRESSION == "zstd"
+    if compress and zstandard is None:
+        _warn_fallback_once("⚠️  SNAPSHOT_COMPRESSION is zstd but zstandard is not installed; writing uncompressed")
+        compress = False
+    dst_path = dst_base + (".tar" + _ZSTD_SUFFIX if compress else ".tar")
+    with open(dst_path, 'wb') as f:
+        stream = zstandard.ZstdCompressor(level=3).stream_writer(f, closefd=False) if compress else f
+        with tarfile.open(fileobj=stream, mode="w|", bufsize=1 << 20) as tf:
+            tf.add(src_dir, arcname=".", filter=_tar_exclude_filter)
+        if compress:
+            stream.close()
+    return dst_path
+
+
+def _tar_exclude_filter(info: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
+    """tarfile.add filter dropping members that match SNAPSHOT_EXCLUDE_PATTERNS."""
+    rel = os.path.normpath(info.name)
+    return None if rel != os.curdir and _is_excluded(rel) else info
+
+
+def _move_excluded(src_root: str, dst_root: str):
+    """Move every path matching SNAPSHOT_EXCLUDE_PATTERNS from src_root to the same place under dst_root."""
+    for dirpath, dirnames, filenames in os.walk(src_root):
+        rel_dir = os.path.relpath(dirpath, src_root)
+        moved_dirs = []
+        for name in dirnames + filenames:
+            rel = os.path.normpath(os.path.join(rel_dir, name))
+            if not _is_excluded(rel):
+                continue
+            target = os.path.join(dst_root, rel)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            if os.path.isdir(target) and not os.path.islink(target):
+                shutil.rmtree(target)
+            os.replace(os.path.join(dirpath, name), target)
+            if name in dirnames:
+                moved_dirs.append(name)
+        # Moved directories are gone from src_root; do not descend into them
+        dirnames[:] = [name for name in dirnames if name not in moved_dirs]
+
+
+def _restore_via_staging(outputs_dir: str, fill) -> None:
+    """Rebuild outputs_dir from a snapshot without touching it until the copy is complete.
+
+    fill(staging_dir) restores the snapshot into a sibling directory. Only once it has
+    succeeded are excluded paths (which snapshots never hold) moved across and the two
+    directories swapped, so a truncated or corrupt snapshot leaves the outputs intact.
+    """
+    base = outputs_dir.rstrip(os.sep)
+    staging_dir, replaced_dir = f"{base}.restoring", f"{base}.replaced"
+    for leftover in (staging_dir, replaced_dir):
+        if os.path.exists(leftover):
+            shutil.rmtree(leftover)
+    try:
+        fill(staging_dir)
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    os.makedirs(staging_dir, exist_ok=True)
+    if os.path.exists(outputs_dir):
+        if config.SNAPSHOT_EXCLUDE_PATTERNS:
+            _move_excluded(outputs_dir, staging_dir)
+        os.rename(outputs_dir, replaced_dir)
+    os.rename(staging_dir, outputs_dir)
+    shutil.rmtree(replaced_dir, ignore_errors=True)
+
+
+def _restore_tar_snapshot(archive_path: str, outputs_dir: str):
+    """Replace the contents of outputs_dir with a tar snapshot.
+
+    The archive is read as a stream, since compressed archives cannot seek, into a
+    staging directory that is swapped in once extraction has finished.
+    """
+    # The "data" filter rejects absolute paths, links out of the tree and device files
+    extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+
+    def extract(staging_dir: str):
+        with open(archive_path, 'rb') as f:
+            stream = zstandard.ZstdDecompressor().stream_reader(f) if archive_path.endswith(_ZSTD_SUFFIX) else f
+            with tarfile.open(fileobj=stream, mode="r|", bufsize=1 << 20) as tf:
+                tf.extractall(staging_dir, **extract_kwargs)
+
+    _restore_via_staging(outputs_dir, extract)
+
+
+class _ZipMmap(mmap.mmap):
+    """Read-only mmap usable as a ZipFile source (mmap gains seekable() only in Python 3.13)."""
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, pos: int, whence: int = os.SEEK_SET):
+        # ZipFile probes for a zip64 trailer by seeking before the start of small
+        # (e.g. empty) archives and expects OSError, as a file would raise, not ValueError
+        try:
+            return super().seek(pos, whence)
+        except ValueError as e:
+            raise OSError(errno.EINVAL, str(e)) from e
+
+
+def _file_crc32(path: str) -> int:
+    """CRC-32 of a file, matching ZipInfo.CRC."""
+    crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _restore_zip_snapshot(archive_path: str, outputs_dir: str):
+    """Replace the contents of outputs_dir with a zip snapshot.
+
+    The archive is memory-mapped so members are paged in on demand rather than
+    read through an intermediate buffer. Members are extracted into a staging
+    directory that is swapped in once extraction has finished; files already in
+    outputs_dir with the same size and CRC are hard-linked into it instead.
+    """
+    live_root = os.path.realpath(outputs_dir)
+
+    def extract(staging_dir: str):
+        root = os.path.realpath(staging_dir)
+        os.makedirs(root, exist_ok=True)
+        with open(archive_path, 'rb') as f, _ZipMmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                zipfile.ZipFile(mm) as zf:
+            for info in zf.infolist():
+                target = os.path.realpath(os.path.join(root, info.filename))
+                if os.path.commonpath([root, target]) != root:
+                    logger.warning("⚠️ Skipping snapshot member outside outputs: %s", info.filename)
+                    continue
+                if info.is_dir():
+                    os.makedirs(target, exist_ok=True)
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+
+                # The live file is about to be replaced by the staging tree, so sharing
+                # its inode cannot leak later edits into the snapshot
+                current = os.path.join(live_root, os.path.relpath(target, root))
+                if (os.path.isfile(current) and not os.path.islink(current)
+                        and os.path.getsize(current) == info.file_size and _file_crc32(current) == info.CRC):
+                    try:
+                        os.link(current, target)
+                        continue
+                    except OSError:
+                        pass
+                with zf.open(info) as src, open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+
+    _restore_via_staging(outputs_dir, extract)
+
+
+@dataclass(slots=True)
 class OperationStep:
     """Represents a single recoverable operation step."""
     step_id: str
@@ -48,7 +958,11 @@ class OperationStep:
         if self.max_retries == 3:  # Only override if using default
             self.max_retries = config.MICRO_CHECKPOINT_MAX_RETRIES
 
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow field dict for serialization; cheaper than asdict()'s recursive copy."""
+        return {name: getattr(self, name) for name in _STEP_FIELDS}
+
+@dataclass(slots=True)
 class OperationProgress:
     """Tracks progress through a multi-step operation."""
     operation_id: str
@@ -66,31 +980,91 @@ class OperationProgress:
             self.failed_steps = []
         if self.operation_state is None:
             self.operation_state = {}
+        now = _utcnow_iso()
         if self.created_at is None:
-            self.created_at = datetime.now(timezone.utc).isoformat()
-        self.updated_at = datetime.now(timezone.utc).isoformat()
+            self.created_at = now
+        self.updated_at = now
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow field dict for serialization."""
+        return {name: getattr(self, name) for name in _PROGRESS_FIELDS}
+
+
+_STEP_FIELDS = tuple(f.name for f in fields(OperationStep))
+_PROGRESS_FIELDS = tuple(f.name for f in fields(OperationProgress))
+
 
 class CheckpointManager:
     """Manages the lifecycle of checkpoints and resumable operations."""
 
     def __init__(self, task_id: str):
-        self.task_id = task_id
+        self._task_id = task_id
         self.operation_registry: Dict[str, OperationProgress] = {}
         self.current_operation: Optional[str] = None
+        # Encoded "steps" array of each tracked operation file. Steps are fixed once an
+        # operation starts, so rewrites of the file only encode its progress.
+        self._encoded_steps: Dict[str, bytes] = {}
+        self._checkpoints_dir: Optional[str] = None
+        self._micro_checkpoints_dir: Optional[str] = None
+        # Parsed progress of each operation file, keyed by filename and validated by mtime
+        self._progress_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        # Name of the newest snapshot, set when this instance saves one or first lists them
+        self._latest_snapshot: Optional[str] = None
+        # (snapshot dir, _scan_tree result) of the last outputs copy this manager made
+        self._last_outputs_snapshot: Optional[Tuple[str, Any]] = None
+        # In-flight background snapshot when ASYNC_STATE_SNAPSHOTS is on
+        self._pending_snapshot: Optional[Future] = None
+        # Step-log entries written per operation, for sampling operation_state into them
+        self._log_counts: Dict[str, int] = {}
+        # Completed/failed events per operation since start, for periodic operation-file rewrites
+        self._progress_events: Dict[str, int] = {}
+
+    @property
+    def task_id(self) -> str:
+        return self._task_id
+
+    @task_id.setter
+    def task_id(self, task_id: str):
+        """Switch to another task, writing out and then dropping everything held for the previous one.
+
+        The module-level instance is created at import, before a --task override, and
+        the root workflow reassigns task_id, so cached paths must not outlive it.
+        """
+        # Land queued writes and close the old task's step logs; flushing also waits for an
+        # in-flight background snapshot, which records its results on the manager when it ends
+        self.flush()
+        _CHECKPOINT_WRITER.close_logs([self._step_log_path(operation_id) for operation_id in self.operation_registry])
+        self._log_counts = {}
+        self._progress_events = {}
+        self._task_id = task_id
+        self._checkpoints_dir = None
+        self._micro_checkpoints_dir = None
+        self._progress_cache = {}
+        self._last_outputs_snapshot = None
+        self._latest_snapshot = None
 
     @property
     def checkpoints_dir(self) -> str:
         """Get the base checkpoints directory for the current task."""
-        path = config.get_checkpoints_dir(self.task_id)
-        os.makedirs(path, exist_ok=True)
-        return path
+        # Resolved and created on first access, then cached; the module-level
+        # instance is built at import time, which should not touch the filesystem.
+        if self._checkpoints_dir is None:
+            self._checkpoints_dir = config.get_checkpoints_dir(self.task_id)
+        return self._checkpoints_dir
+
+    @property
+    def objects_dir(self) -> str:
+        """Get the content-addressed blob store shared by "content" mode snapshots."""
+        return os.path.join(self.checkpoints_dir, "objects")
 
     @property
     def micro_checkpoints_dir(self) -> str:
         """Get the micro-checkpoints directory, ensuring it exists."""
-        path = os.path.join(self.checkpoints_dir, "micro_checkpoints")
-        os.makedirs(path, exist_ok=True)
-        return path
+        if self._micro_checkpoints_dir is None:
+            path = os.path.join(self.checkpoints_dir, "micro_checkpoints")
+            os.makedirs(path, exist_ok=True)
+            self._micro_checkpoints_dir = path
+        return self._micro_checkpoints_dir
 
     def start_operation(self, 
                        operation_id: str,
@@ -110,21 +1084,13 @@ class CheckpointManager:
             operation_state=operation_state or {}
         )
         
-        operation_path = os.path.join(self.micro_checkpoints_dir, f"operation_{operation_id}.json")
-        
-        operation_data = {
-            "progress": asdict(progress),
-            "steps": [asdict(step) for step in steps],
-            "checkpoints": []
-        }
-        
-        with open(operation_path, 'w') as f:
-            json.dump(operation_data, f, indent=2, default=str)
-        
+        self._encoded_steps[operation_id] = dumps([step.to_dict() for step in steps])
         self.operation_registry[operation_id] = progress
+        self._write_operation_file(operation_id)
+        
         self.current_operation = operation_id
         
-        logger.info(f"🔍 Started micro-tracked operation: {operation_id} for agent {agent_name} with {len(steps)} steps.")
+        logger.info("🔍 Started micro-tracked operation: %s for agent %s with %s steps.", operation_id, agent_name, len(steps))
         return operation_id
 
     @contextmanager
@@ -134,67 +1100,88 @@ class CheckpointManager:
             raise ValueError("No active operation - call start_operation() first")
         
         operation_id = self.current_operation
-        step.started_at = datetime.now(timezone.utc).isoformat()
+        step.started_at = _utcnow_iso()
         
-        logger.info(f"🔄 Executing step: {step.step_name}")
+        logger.debug("🔄 Executing step: %s", step.step_name)
         
         try:
-            self._create_step_checkpoint(operation_id, step, "pre_execution")
+            self._create_step_checkpoint(operation_id, step, "pre_execution", ts=step.started_at)
             yield step
-            step.completed_at = datetime.now(timezone.utc).isoformat()
-            self._mark_step_completed(operation_id, step.step_id)
-            self._create_step_checkpoint(operation_id, step, "completed")
-            logger.info(f"✅ Step completed: {step.step_name}")
+            step.completed_at = _utcnow_iso()
+            self._mark_step_completed(operation_id, step.step_id, ts=step.completed_at)
+            self._create_step_checkpoint(operation_id, step, "completed", ts=step.completed_at)
+            logger.debug("✅ Step completed: %s", step.step_name)
         except Exception as e:
+            failed_at = _utcnow_iso()
             step.error_info = {
                 "error_type": type(e).__name__,
                 "error_message": str(e),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": failed_at,
                 "retry_count": step.retry_count
             }
-            self._create_step_checkpoint(operation_id, step, "failed")
-            self._mark_step_failed(operation_id, step.step_id, step.error_info)
-            logger.error(f"❌ Step failed: {step.step_name} - {e}")
+            self._create_step_checkpoint(operation_id, step, "failed", ts=failed_at)
+            self._mark_step_failed(operation_id, step.step_id, step.error_info, ts=failed_at)
+            logger.error("❌ Step failed: %s - %s", step.step_name, e)
             if step.retry_count < step.max_retries:
                 step.retry_count += 1
-                logger.warning(f"🔄 Retrying step (attempt {step.retry_count + 1}/{step.max_retries + 1})")
+                logger.warning("🔄 Retrying step (attempt %s/%s)", step.retry_count + 1, step.max_retries + 1)
                 raise
             else:
-                logger.critical(f"💀 Step failed permanently after {step.max_retries} retries")
+                logger.critical("💀 Step failed permanently after %s retries", step.max_retries)
                 raise
 
     def resume_operation(self, operation_id: str) -> Optional[OperationProgress]:
         """Resume a partially completed operation."""
+        # Progress is written behind the steps; make sure the file on disk is current
+        self.flush()
         operation_path = os.path.join(self.micro_checkpoints_dir, f"operation_{operation_id}.json")
         if not os.path.exists(operation_path):
-            logger.error(f"❌ Operation not found: {operation_id}")
+            logger.error("❌ Operation not found: %s", operation_id)
             return None
         
         try:
-            with open(operation_path, 'r') as f:
-                operation_data = json.load(f)
+            with open(operation_path, 'rb') as f:
+                operation_data = loads(f.read())
+            _replay_step_log(operation_data["progress"], self._step_log_path(operation_id))
             
             progress = OperationProgress(**operation_data["progress"])
+            self._encoded_steps[operation_id] = dumps(operation_data["steps"])
             self.operation_registry[operation_id] = progress
             self.current_operation = operation_id
             
-            logger.info(f"🔄 RESUMING MICRO-OPERATION: {operation_id}")
+            logger.info("🔄 RESUMING MICRO-OPERATION: %s", operation_id)
             return progress
         except Exception as e:
-            logger.error(f"❌ Error resuming operation {operation_id}: {e}")
+            logger.error("❌ Error resuming operation %s: %s", operation_id, e)
             return None
 
     def list_recoverable_operations(self) -> List[Dict[str, Any]]:
         """List operations that can be resumed."""
+        self.flush()
         operations = []
         if not os.path.exists(self.micro_checkpoints_dir):
             return operations
         
-        for filename in os.listdir(self.micro_checkpoints_dir):
-            if filename.startswith("operation_") and filename.endswith(".json"):
+        seen = set()
+        with os.scandir(self.micro_checkpoints_dir) as it:
+            for entry in it:
+                if not _OPERATION_FILE_RE.match(entry.name) or not entry.is_file():
+                    continue
+                seen.add(entry.name)
                 try:
-                    with open(os.path.join(self.micro_checkpoints_dir, filename), 'r') as f:
-                        progress = json.load(f)["progress"]
+                    # Progress is the operation file plus whatever its step log has added since
+                    log_path = entry.path[:-len(".json")] + ".checkpoints.jsonl"
+                    try:
+                        log_size = os.stat(log_path).st_size
+                    except FileNotFoundError:
+                        log_size = -1
+                    version = (entry.stat().st_mtime_ns, log_size)
+                    cached = self._progress_cache.get(entry.name)
+                    if cached is not None and cached[0] == version:
+                        progress = cached[1]
+                    else:
+                        progress = _replay_step_log(_load_json_mapped(entry.path)["progress"], log_path)
+                        self._progress_cache[entry.name] = (version, progress)
                     if len(progress["completed_steps"]) < progress["total_steps"]:
                         operations.append({
                             "operation_id": progress["operation_id"],
@@ -205,70 +1192,208 @@ class CheckpointManager:
                             "current_step": progress.get("current_step")
                         })
                 except Exception as e:
-                    logger.warning(f"⚠️  Error reading operation {filename}: {e}")
+                    logger.warning("⚠️  Error reading operation %s: %s", entry.name, e)
+        
+        # Drop cache entries for files that were completed or removed since the last scan
+        for name in self._progress_cache.keys() - seen:
+            del self._progress_cache[name]
         
         return sorted(operations, key=lambda x: x["created_at"], reverse=True)
 
     def save_state_snapshot(self, state: DOMISessionState, phase: str):
-        """Save a complete snapshot of the application state and outputs."""
-        timestamp = datetime.now(timezone.utc).isoformat().replace(":", "-").replace(".", "-")
+        """Save a complete snapshot of the application state and outputs.
+
+        With ASYNC_STATE_SNAPSHOTS the state is encoded here but the files are written
+        by a background thread; at most one snapshot is in flight, and anything that
+        reads snapshots waits for it first.
+        """
+        # The previous snapshot must be complete before it can serve as a link source
+        self._wait_for_snapshot()
+        timestamp = datetime.now(timezone.utc).strftime(_SNAPSHOT_TS_FORMAT)
+        previous_snapshots = self.get_sorted_snapshots()
         snapshot_name = f"snapshot_{phase}_{timestamp}"
+        state_files = _encode_state(state)
+
+        if not config.ASYNC_STATE_SNAPSHOTS:
+            self._write_snapshot(snapshot_name, state_files, previous_snapshots)
+            return
+        self._pending_snapshot = _ASYNC_SNAPSHOT_WRITER.submit(
+            self._write_snapshot, snapshot_name, state_files, previous_snapshots
+        )
+
+    def _write_snapshot(self, snapshot_name: str, state_files: List[Tuple[str, Any]],
+                        previous_snapshots: List[str]):
+        """Write the encoded state files and a copy of the outputs into a new snapshot directory."""
         snapshot_dir = os.path.join(self.checkpoints_dir, snapshot_name)
         os.makedirs(snapshot_dir, exist_ok=True)
 
-        state_path = os.path.join(snapshot_dir, "domi_state.json")
-        with open(state_path, 'w') as f:
-            json.dump(state.model_dump(), f, indent=2)
+        # The state write and the outputs copy are independent and I/O-bound, so they overlap
+        try:
+            state_future = _SNAPSHOT_EXECUTOR.submit(_write_state_files, snapshot_dir, state_files)
+        except RuntimeError:
+            # Interpreter shutdown: a background snapshot finishing at exit writes serially
+            state_future = None
+            _write_state_files(snapshot_dir, state_files)
+        try:
+            self._snapshot_outputs(snapshot_dir, previous_snapshots)
+        finally:
+            if state_future is not None:
+                state_future.result()
+
+        # One filesystem-wide flush for the state, manifest and every copied file, rather
+        # than a sync per file; the pointer is only moved once all of it is durable
+        _syncfs(snapshot_dir)
+        self._latest_snapshot = snapshot_name
+        _atomic_write_bytes(os.path.join(self.checkpoints_dir, _LATEST_SNAPSHOT_POINTER), snapshot_name.encode("utf-8"))
+        logger.info("[CheckpointManager]: Saved state snapshot to %s", snapshot_dir)
+
+    def _wait_for_snapshot(self):
+        """Wait for an in-flight background snapshot, logging rather than raising its failure."""
+        pending, self._pending_snapshot = self._pending_snapshot, None
+        if pending is not None:
+            try:
+                pending.result()
+            except Exception as e:
+                logger.error("❌ Background state snapshot failed: %s", e)
+
+    def _snapshot_outputs(self, snapshot_dir: str, previous_snapshots: List[str]):
+        """Copy the task outputs into a snapshot directory using the configured SNAPSHOT_MODE.
 
+        When no output file or directory changed (by size and mtime) since the last
+        snapshot this manager saved, that snapshot's copy is linked instead.
+        """
         outputs_dir = config.get_outputs_dir(self.task_id)
-        if os.path.exists(outputs_dir):
-            archive_path = os.path.join(snapshot_dir, "outputs_snapshot")
-            shutil.make_archive(archive_path, 'zip', outputs_dir)
-            logger.info(f"Saved and archived outputs to {archive_path}.zip")
+        if not os.path.exists(outputs_dir):
+            return
+        fingerprint = _scan_tree(outputs_dir)
+        last = self._last_outputs_snapshot
+        if last is not None and last[1] == fingerprint and os.path.isdir(last[0]):
+            _reuse_outputs_snapshot(last[0], snapshot_dir)
+            logger.info("Outputs unchanged since %s; linked its copy", os.path.basename(last[0]))
+            self._last_outputs_snapshot = (snapshot_dir, fingerprint)
+            return
 
-        logger.info(f"[CheckpointManager]: Saved state snapshot to {snapshot_dir}")
+        archive_path = os.path.join(snapshot_dir, "outputs_snapshot")
+        if config.SNAPSHOT_MODE in ("clone", "hardlink"):
+            _clone_tree(outputs_dir, archive_path)
+            logger.info("Saved cloned outputs to %s", archive_path)
+        elif config.SNAPSHOT_MODE == "incremental":
+            previous = next(
+                (os.path.join(self.checkpoints_dir, name) for name in previous_snapshots
+                 if os.path.exists(os.path.join(self.checkpoints_dir, name, _MANIFEST_NAME))),
+                None
+            )
+            copied, linked = _save_incremental_snapshot(outputs_dir, snapshot_dir, previous)
+            logger.info("Saved outputs to %s (%s copied, %s unchanged)", archive_path, copied, linked)
+        elif config.SNAPSHOT_MODE == "content":
+            previous = next(
+                (os.path.join(self.checkpoints_dir, name) for name in previous_snapshots
+                 if os.path.exists(os.path.join(self.checkpoints_dir, name, _CONTENT_MANIFEST_NAME))),
+                None
+            )
+            stored, reused = _save_content_snapshot(outputs_dir, snapshot_dir, self.objects_dir, previous)
+            logger.info("Saved outputs manifest to %s (%s new blobs, %s deduplicated)", snapshot_dir, stored, reused)
+        elif config.SNAPSHOT_MODE == "tar":
+            tar_path = _tar_store(outputs_dir, archive_path)
+            logger.info("Saved and archived outputs to %s", tar_path)
+        else:
+            _zip_store(outputs_dir, f"{archive_path}.zip")
+            logger.info("Saved and archived outputs to %s.zip", archive_path)
+        self._last_outputs_snapshot = (snapshot_dir, fingerprint)
 
     def load_latest_snapshot(self) -> Optional[DOMISessionState]:
         """Load the most recent state snapshot and restore outputs."""
-        snapshots = self.get_sorted_snapshots()
-        if not snapshots:
+        self._wait_for_snapshot()
+        latest = self._get_latest_snapshot()
+        if latest is None:
             return None
 
-        latest_snapshot_dir = os.path.join(self.checkpoints_dir, snapshots[0])
-        state_path = os.path.join(latest_snapshot_dir, "domi_state.json")
-        archive_path = os.path.join(latest_snapshot_dir, "outputs_snapshot.zip")
+        latest_snapshot_dir = os.path.join(self.checkpoints_dir, latest)
+        linked_path = os.path.join(latest_snapshot_dir, "outputs_snapshot")
+        archive_path = linked_path + ".zip"
 
-        if os.path.exists(state_path):
-            with open(state_path, 'r') as f:
-                state = DOMISessionState(**json.load(f))
+        state_data = _load_state_file(latest_snapshot_dir)
+        if state_data is not None:
+            state = DOMISessionState(**state_data)
             
-            if os.path.exists(archive_path):
+            # Restore whichever form the snapshot was saved in, regardless of the current mode
+            content_manifest = os.path.join(latest_snapshot_dir, _CONTENT_MANIFEST_NAME)
+            if os.path.exists(content_manifest):
+                outputs_dir = config.get_outputs_dir(self.task_id)
+                _restore_content_snapshot(content_manifest, self.objects_dir, outputs_dir)
+                logger.info("Restored outputs from %s", content_manifest)
+            elif os.path.exists(os.path.join(latest_snapshot_dir, _MANIFEST_NAME)):
+                # Incremental snapshot: copy out so the snapshot's files stay private
+                outputs_dir = config.get_outputs_dir(self.task_id)
+                _sync_tree(linked_path, outputs_dir)
+                logger.info("Restored outputs from %s", linked_path)
+            elif os.path.isdir(linked_path):
+                outputs_dir = config.get_outputs_dir(self.task_id)
+                _restore_via_staging(outputs_dir, lambda staging_dir: _clone_tree(linked_path, staging_dir))
+                logger.info("Restored outputs from %s", linked_path)
+            elif os.path.exists(archive_path):
                 outputs_dir = config.get_outputs_dir(self.task_id)
-                if os.path.exists(outputs_dir):
-                    shutil.rmtree(outputs_dir)
-                shutil.unpack_archive(archive_path, outputs_dir)
-                logger.info(f"Restored outputs from {archive_path}")
+                _restore_zip_snapshot(archive_path, outputs_dir)
+                logger.info("Restored outputs from %s", archive_path)
+            else:
+                for tar_path in (linked_path + ".tar", linked_path + ".tar" + _ZSTD_SUFFIX):
+                    if not os.path.exists(tar_path):
+                        continue
+                    if tar_path.endswith(_ZSTD_SUFFIX) and zstandard is None:
+                        raise RuntimeError(f"Snapshot outputs {tar_path} need the zstandard package to load")
+                    _restore_tar_snapshot(tar_path, config.get_outputs_dir(self.task_id))
+                    logger.info("Restored outputs from %s", tar_path)
+                    break
 
             return state
         return None
 
     def has_snapshot(self) -> bool:
         """Check if any snapshots exist for the current task."""
-        return bool(self.get_sorted_snapshots())
+        self._wait_for_snapshot()
+        return self._get_latest_snapshot() is not None
+
+    def _get_latest_snapshot(self) -> Optional[str]:
+        """Name of the most recent snapshot, from memory, the pointer file, or a directory listing."""
+        if self._latest_snapshot is None:
+            try:
+                with open(os.path.join(self.checkpoints_dir, _LATEST_SNAPSHOT_POINTER), 'rb') as f:
+                    name = f.read().decode("utf-8").strip()
+                if name and os.path.isdir(os.path.join(self.checkpoints_dir, name)):
+                    self._latest_snapshot = name
+            except OSError:
+                pass
+        if self._latest_snapshot is None:
+            snapshots = self.get_sorted_snapshots()
+            if snapshots:
+                self._latest_snapshot = snapshots[0]
+        return self._latest_snapshot
 
     def get_sorted_snapshots(self) -> List[str]:
         """Get a sorted list of all snapshots for the current task."""
         if not os.path.exists(self.checkpoints_dir):
             return []
+        # Only save_state_snapshot creates snapshot_* entries, always as directories, so the
+        # name alone identifies them. Names are snapshot_<phase>_<timestamp>; sort on the
+        # timestamp, since sorting whole names would order by phase first.
         return sorted(
-            [d for d in os.listdir(self.checkpoints_dir) if os.path.isdir(os.path.join(self.checkpoints_dir, d)) and d.startswith('snapshot_')],
+            [d for d in os.listdir(self.checkpoints_dir) if d.startswith('snapshot_')],
+            key=lambda name: name.rsplit('_', 1)[-1],
             reverse=True
         )
 
-    def _create_step_checkpoint(self, operation_id: str, step: OperationStep, phase: str):
-        """Create a checkpoint for a specific step phase."""
-        timestamp = datetime.now(timezone.utc).isoformat()
-        checkpoint_id = f"step_{operation_id}_{step.step_id}_{phase}_{timestamp.replace(':', '-').replace('.', '-')}"
+    def _create_step_checkpoint(self, operation_id: str, step: OperationStep, phase: str,
+                                ts: Optional[str] = None):
+        """Create a checkpoint for a specific step phase.
+
+        Args:
+            operation_id: Operation the step belongs to
+            step: Step being checkpointed
+            phase: "pre_execution", "completed" or "failed"
+            ts: ISO timestamp of the event; defaults to now
+        """
+        timestamp = ts or _utcnow_iso()
+        checkpoint_id = f"step_{operation_id}_{step.step_id}_{phase}_{timestamp.translate(_DASH_TRANS)}"
         
         checkpoint_data = {
             "checkpoint_id": checkpoint_id,
@@ -276,57 +1401,113 @@ class CheckpointManager:
             "step_id": step.step_id,
             "phase": phase,
             "timestamp": timestamp,
-            "step_data": asdict(step),
-            "operation_state": self.operation_registry[operation_id].operation_state
+            # Encoded by dumps right below, so the live dataclass can go in without a copy
+            "step_data": step,
         }
+        # The operation file carries the latest state; the log only samples it for replay
+        entry_index = self._log_counts.get(operation_id, 0)
+        self._log_counts[operation_id] = entry_index + 1
+        interval = config.MICRO_CHECKPOINT_STATE_INTERVAL
+        if interval > 0 and entry_index % interval == 0:
+            checkpoint_data["operation_state"] = self.operation_registry[operation_id].operation_state
         
-        checkpoint_path = os.path.join(self.micro_checkpoints_dir, f"{checkpoint_id}.json")
-        with open(checkpoint_path, 'w') as f:
-            json.dump(checkpoint_data, f, indent=2, default=str)
+        # One append-only log per operation, written behind the step by a background thread
+        _CHECKPOINT_WRITER.append_line(self._step_log_path(operation_id), dumps(checkpoint_data, indent=False) + b"\n")
         
-        if config.VERBOSE_LOGGING:
-            logger.debug(f"   💾 Micro-checkpoint: {checkpoint_id}")
+        logger.debug("   💾 Micro-checkpoint: %s", checkpoint_id)
 
-    def _mark_step_completed(self, operation_id: str, step_id: str):
+    def flush(self):
+        """Block until any background snapshot and every queued checkpoint write are written and synced."""
+        self._wait_for_snapshot()
+        _CHECKPOINT_WRITER.flush()
+
+    def _mark_step_completed(self, operation_id: str, step_id: str, ts: Optional[str] = None):
         """Mark a step as completed in the operation progress."""
         progress = self.operation_registry[operation_id]
         if step_id not in progress.completed_steps:
             progress.completed_steps.append(step_id)
-        progress.updated_at = datetime.now(timezone.utc).isoformat()
-        self._save_operation_progress(operation_id)
+        progress.updated_at = ts or _utcnow_iso()
+        self._record_progress_event(operation_id)
 
-    def _mark_step_failed(self, operation_id: str, step_id: str, error_info: Dict[str, Any]):
+    def _mark_step_failed(self, operation_id: str, step_id: str, error_info: Dict[str, Any],
+                          ts: Optional[str] = None):
         """Mark a step as failed in the operation progress."""
         progress = self.operation_registry[operation_id]
         if step_id not in progress.failed_steps:
             progress.failed_steps.append(step_id)
-        progress.updated_at = datetime.now(timezone.utc).isoformat()
-        self._save_operation_progress(operation_id)
+        progress.updated_at = ts or _utcnow_iso()
+        self._record_progress_event(operation_id)
+
+    def _record_progress_event(self, operation_id: str):
+        """Persist progress after a step completes or fails.
+
+        The step log entry written for the event already makes it durable, so the
+        operation file is only rewritten every OPERATION_FILE_REWRITE_INTERVAL events
+        instead of on each one; readers replay the log past it.
+        """
+        count = self._progress_events.get(operation_id, 0) + 1
+        self._progress_events[operation_id] = count
+        interval = config.OPERATION_FILE_REWRITE_INTERVAL
+        if interval <= 1 or count % interval == 0:
+            self._save_operation_progress(operation_id)
+
+    def _step_log_path(self, operation_id: str) -> str:
+        return os.path.join(self.micro_checkpoints_dir, f"operation_{operation_id}.checkpoints.jsonl")
+
+    def _operation_file_chunks(self, operation_id: str) -> List[bytes]:
+        """Encode an operation file as chunks, reusing its steps encoded at start."""
+        return [
+            b'{\n"progress": ', dumps(self.operation_registry[operation_id].to_dict()),
+            b',\n"steps": ', self._encoded_steps[operation_id],
+            b',\n"checkpoints": []\n}',
+        ]
+
+    def _write_operation_file(self, operation_id: str):
+        """Atomically rewrite an operation file from its in-memory data."""
+        operation_path = os.path.join(self.micro_checkpoints_dir, f"operation_{operation_id}.json")
+        _atomic_write_bytes(operation_path, self._operation_file_chunks(operation_id))
 
     def _save_operation_progress(self, operation_id: str):
         """Save the current operation progress to disk."""
         operation_path = os.path.join(self.micro_checkpoints_dir, f"operation_{operation_id}.json")
+        if operation_id in self._encoded_steps:
+            # No need to re-read the file: memory already holds everything it contains. Only
+            # the progress is encoded here, as of this call; the steps, which embed each
+            # step's input_state, were encoded once. The writer thread does the write.
+            _CHECKPOINT_WRITER.write_file(operation_path, self._operation_file_chunks(operation_id))
+            return
+        
         if os.path.exists(operation_path):
-            with open(operation_path, 'r') as f:
-                operation_data = json.load(f)
-            operation_data["progress"] = asdict(self.operation_registry[operation_id])
-            with open(operation_path, 'w') as f:
-                json.dump(operation_data, f, indent=2, default=str)
+            with open(operation_path, 'rb') as f:
+                operation_data = loads(f.read())
+            operation_data["progress"] = self.operation_registry[operation_id].to_dict()
+            _atomic_write_bytes(operation_path, dumps(operation_data))
 
     def mark_operation_complete(self, operation_id: str):
         """Mark an operation as complete and archive it."""
+        if operation_id in self._encoded_steps and operation_id in self.operation_registry:
+            # Leave the archived operation file with its final progress
+            self._save_operation_progress(operation_id)
+        self._encoded_steps.pop(operation_id, None)
+        self._log_counts.pop(operation_id, None)
+        self._progress_events.pop(operation_id, None)
+        self._wait_for_snapshot()
+        _CHECKPOINT_WRITER.close_logs([self._step_log_path(operation_id)])
         if operation_id in self.operation_registry:
             del self.operation_registry[operation_id]
             if self.current_operation == operation_id:
                 self.current_operation = None
-            logger.info(f"✓ Marked operation complete: {operation_id}")
+            logger.info("✓ Marked operation complete: %s", operation_id)
         
-        # Instead of deleting, archive the operation file for history
-        op_path = os.path.join(self.micro_checkpoints_dir, f"operation_{operation_id}.json")
-        if os.path.exists(op_path):
-            archive_dir = os.path.join(self.micro_checkpoints_dir, "completed")
-            os.makedirs(archive_dir, exist_ok=True)
-            shutil.move(op_path, os.path.join(archive_dir, f"operation_{operation_id}.json"))
+        # Instead of deleting, keep the operation file and its step log for history under
+        # a ".done" name, so listing recoverable operations can skip them by name alone
+        for filename, done_name in (
+            (f"operation_{operation_id}.json", f"operation_{operation_id}.done.json"),
+            (f"operation_{operation_id}.checkpoints.jsonl", f"operation_{operation_id}.done.checkpoints.jsonl"),
+        ):
+            op_path = os.path.join(self.micro_checkpoints_dir, filename)
+            if os.path.exists(op_path):
+                os.replace(op_path, os.path.join(self.micro_checkpoints_dir, done_name))
 
 # Global instance for convenience, though direct instantiation is preferred for multi-tasking
 checkpoint_manager = CheckpointManager(config.TASK_ID)
\ No newline at end of file
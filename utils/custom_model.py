@@ -5,11 +5,25 @@ Custom model wrapper for Gemini endpoint with x-goog-api-key header
 """
 
 import os
+from functools import lru_cache
 from typing import Any, Dict, Optional
 from google.genai import Client
 from google.genai.types import GenerateContentConfig
 from google.adk.models import BaseGenerativeModel
 
+
+@lru_cache(maxsize=16)
+def _generation_config(temperature: float, max_output_tokens: int) -> GenerateContentConfig:
+    """Build (once per distinct setting) the generation config shared by all requests using it."""
+    return GenerateContentConfig(temperature=temperature, max_output_tokens=max_output_tokens)
+
+
+def _config_for(config: Optional[Dict[str, Any]]) -> GenerateContentConfig:
+    """Resolve a request's optional config dict to a cached GenerateContentConfig."""
+    config = config or {}
+    return _generation_config(config.get('temperature', 0.1), config.get('max_output_tokens', 4000))
+
+
 class CustomGeminiModel(BaseGenerativeModel):
     """Custom model that uses x-goog-api-key header for authentication"""
     
@@ -31,10 +45,7 @@ class CustomGeminiModel(BaseGenerativeModel):
         
     async def generate_content(self, prompt: str, config: Optional[Dict[str, Any]] = None):
         """Generate content using the custom endpoint"""
-        generation_config = GenerateContentConfig(
-            temperature=config.get('temperature', 0.1) if config else 0.1,
-            max_output_tokens=config.get('max_output_tokens', 4000) if config else 4000,
-        )
+        generation_config = _config_for(config)
         
         # Make the request with x-goog-api-key header
         response = await self.client.models.generate_content(
@@ -48,10 +59,7 @@ class CustomGeminiModel(BaseGenerativeModel):
     
     async def generate_content_stream(self, prompt: str, config: Optional[Dict[str, Any]] = None):
         """Generate content with streaming"""
-        generation_config = GenerateContentConfig(
-            temperature=config.get('temperature', 0.1) if config else 0.1,
-            max_output_tokens=config.get('max_output_tokens', 4000) if config else 4000,
-        )
+        generation_config = _config_for(config)
         
         # Stream the response
         async for chunk in self.client.models.generate_content_stream(
@@ -1,34 +1,123 @@
 import os
+from functools import lru_cache
+from typing import List, Set, Tuple
 from .. import config
 
+# Path helpers build paths by concatenation, which is cheaper than os.path.join per call
+_SEP = os.sep
+
+# Task output subdirectories, relative to the outputs dir (see DIRECTORY_STRUCTURE_SPEC in prompts/base.py).
+# Parents are listed before their children.
+DIRECTORY_STRUCTURE = [
+    "planning",
+    "planning/critiques",
+    "implementation",
+    "implementation/code",
+    "execution",
+    "workspace",
+    "workspace/scripts",
+    "workspace/notebooks",
+    "workspace/src",
+    "workspace/tests",
+    "results",
+    "results/deliverables",
+    "results/deliverables/presentations",
+    "results/charts",
+    "data",
+    "data/external",
+    "data/processed",
+    "data/raw",
+]
+
+# Shallowest first (the sort is stable), so every parent is created before its children
+# and each directory needs a single os.mkdir
+_STRUCTURE_BY_DEPTH = tuple(sorted(DIRECTORY_STRUCTURE, key=lambda rel: rel.count("/")))
+
+# Directories of the structure that have subdirectories of their own in it
+_STRUCTURE_PARENTS = {os.path.dirname(rel) for rel in DIRECTORY_STRUCTURE} - {""}
+
+
+def _existing_structure_dirs(outputs_dir: str) -> Set[str]:
+    """Find which structure directories already exist, with one scandir per existing parent."""
+    existing = set()
+    pending = [""]
+    while pending:
+        rel = pending.pop()
+        try:
+            with os.scandir(f"{outputs_dir}{_SEP}{rel}" if rel else outputs_dir) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        child = f"{rel}/{entry.name}" if rel else entry.name
+                        existing.add(child)
+                        if child in _STRUCTURE_PARENTS:
+                            pending.append(child)
+        except FileNotFoundError:
+            pass
+    return existing
+
+
+def create_task_directory_structure(outputs_dir: str) -> List[str]:
+    """Create the standard task directory structure under an outputs directory.
+
+    Existing directories are detected in one pass up front, so a warm task costs
+    a handful of scandir calls instead of a makedirs stat chain per directory.
+
+    Args:
+        outputs_dir: Root outputs directory of the task
+
+    Returns:
+        Relative paths of the directories that had to be created
+    """
+    os.makedirs(outputs_dir, exist_ok=True)
+    existing = _existing_structure_dirs(outputs_dir)
+    missing = [rel for rel in _STRUCTURE_BY_DEPTH if rel not in existing]
+    for rel in missing:
+        try:
+            os.mkdir(f"{outputs_dir}{_SEP}{rel}")
+        except FileExistsError:
+            pass
+    return missing
+
+
+@lru_cache(maxsize=64)
+def _cached_subdir(base_dir: str, task_id: str, parts: Tuple[str, ...]) -> str:
+    return os.path.join(config.get_task_specific_dir(base_dir, task_id), *parts)
+
+
+def _task_subdir(task_id: str, *parts: str) -> str:
+    """Get (and memoize) a subdirectory path of a task's outputs dir."""
+    # Keyed on the resolved base dir and task id, so changes to config.TASK_ID still apply
+    return _cached_subdir(config.OUTPUTS_BASE_DIR, task_id or config.TASK_ID, parts)
+
+
 def get_research_plan_path(task_id: str, version: int) -> str:
     """Gets the path for a research plan of a specific version."""
-    return os.path.join(config.get_outputs_dir(task_id), "planning", f"research_plan_v{version}.md")
+    return f"{_task_subdir(task_id, 'planning')}{_SEP}research_plan_v{version}.md"
 
 def get_critique_path(task_id: str, version: int, role: str) -> str:
     """Gets the path for a critique file."""
-    return os.path.join(config.get_outputs_dir(task_id), "planning", "critiques", f"{role}_critique_v{version}.md")
+    return f"{_task_subdir(task_id, 'planning', 'critiques')}{_SEP}{role}_critique_v{version}.md"
 
 def get_implementation_manifest_path(task_id: str) -> str:
     """Gets the path for the implementation manifest."""
-    return os.path.join(config.get_outputs_dir(task_id), "implementation", "orchestration_plan.json")
+    return f"{_task_subdir(task_id, 'implementation')}{_SEP}orchestration_plan.json"
 
 def get_execution_journal_path(task_id: str) -> str:
     """Gets the path for the execution journal."""
-    return os.path.join(config.get_outputs_dir(task_id), "execution", "execution_journal.md")
+    return f"{_task_subdir(task_id, 'execution')}{_SEP}execution_journal.md"
 
 def get_results_extraction_script_path(task_id: str) -> str:
     """Gets the path for the results extraction script."""
-    return os.path.join(config.get_outputs_dir(task_id), "workspace", "scripts", "results_extraction.py")
+    return f"{_task_subdir(task_id, 'workspace', 'scripts')}{_SEP}results_extraction.py"
 
 def get_final_report_path(task_id: str) -> str:
     """Gets the path for the final report."""
-    return os.path.join(config.get_outputs_dir(task_id), "results", "deliverables", "final_report.md")
+    return f"{_task_subdir(task_id, 'results', 'deliverables')}{_SEP}final_report.md"
 
 def get_parallel_validation_path(task_id: str, version: int, index: int) -> str:
     """Gets the path for a parallel validation file."""
-    return os.path.join(config.get_outputs_dir(task_id), "planning", "critiques", f"parallel_validation_{index}_v{version}.md")
+    return f"{_task_subdir(task_id, 'planning', 'critiques')}{_SEP}parallel_validation_{index}_v{version}.md"
 
 def get_coder_output_path(task_id: str, sub_task_id: str, version: int) -> str:
     """Gets the path for a coder's output for a specific sub-task and version."""
-    return os.path.join(config.get_outputs_dir(task_id), "implementation", "code", f"{sub_task_id}_v{version}.py")
\ No newline at end of file
+    return f"{_task_subdir(task_id, 'implementation', 'code')}{_SEP}{sub_task_id}_v{version}.py"
\ No newline at end of file
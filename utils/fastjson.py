@@ -0,0 +1,52 @@
+# /department_of_market_intelligence/utils/fastjson.py
+"""
+JSON serialization helpers for checkpoint files.
+Uses orjson when it is installed and falls back to the standard library otherwise.
+Both paths produce UTF-8 bytes, so callers always read and write files in binary mode.
+"""
+
+import dataclasses
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    _ORJSON_INDENT_OPTIONS = _ORJSON_OPTIONS | orjson.OPT_INDENT_2
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback encoder for the standard library: dataclasses as field dicts, anything else as str()."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    return str(obj)
+
+
+def dumps(obj: Any, indent: bool = True) -> bytes:
+    """Serialize an object to JSON bytes.
+
+    Args:
+        obj: Object to serialize. Dataclass instances are encoded as objects of their
+            fields, without an intermediate dict under orjson. Other values JSON cannot
+            represent are converted with str().
+        indent: If True, pretty-print with two-space indentation.
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=_ORJSON_INDENT_OPTIONS if indent else _ORJSON_OPTIONS)
+    return json.dumps(obj, indent=2 if indent else None, default=_json_default, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Deserialize JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
@@ -3,7 +3,6 @@
 
 import logging
 import sys
-import re
 from .. import config
 
 def get_logger(name: str) -> logging.Logger:
@@ -25,35 +24,41 @@ def get_logger(name: str) -> logging.Logger:
         
     return logger
 
+# Noise from ADK, MCP and Desktop Commander startup/teardown that OutputFilter drops.
+# All plain substrings: a few C-level `in` scans beat running the regex engine per write.
+_SUPPRESS_LITERALS = (
+    "auth_config or auth_config.auth_scheme is missing",
+    "Will skip authentication.Using FunctionTool",
+    "Generating tools list",
+    "[EXPERIMENTAL] BaseAuthenticatedTool",
+    "UserWarning",
+    "Loading server.ts",
+    "Setting up request handlers",
+    "[desktop-commander] Initialized",
+    "Loading configuration",
+    "Configuration loaded successfully",
+    "Connecting server",
+    "Server connected successfully",
+    "stdio_client",
+    "cancel scope",  # also covers "RuntimeError: Attempted to exit cancel scope"
+    "GeneratorExit",
+    "BaseExceptionGroup",
+)
+# Writes shorter than this (e.g. the bare newline print() emits) cannot contain any of them
+_MIN_SUPPRESS_LEN = min(len(literal) for literal in _SUPPRESS_LITERALS)
+
+
 class OutputFilter:
     """A stream wrapper to filter out unwanted log messages."""
     def __init__(self, stream):
         self.stream = stream
-        # Compile a single regex for efficiency
-        suppress_patterns = [
-            "auth_config or auth_config.auth_scheme is missing",
-            "Will skip authentication.Using FunctionTool",
-            "Generating tools list",
-            r"\[EXPERIMENTAL\] BaseAuthenticatedTool",
-            "UserWarning",
-            "Loading server.ts",
-            "Setting up request handlers",
-            r"\[desktop-commander\] Initialized",
-            "Loading configuration",
-            "Configuration loaded successfully",
-            "Connecting server",
-            "Server connected successfully",
-            "stdio_client",
-            "cancel scope",
-            "GeneratorExit",
-            "BaseExceptionGroup",
-            r"RuntimeError: Attempted to exit cancel scope"
-        ]
-        self.suppress_regex = re.compile('|'.join(suppress_patterns))
 
     def write(self, text):
-        if not self.suppress_regex.search(text):
-            self.stream.write(text)
+        if len(text) >= _MIN_SUPPRESS_LEN:
+            for literal in _SUPPRESS_LITERALS:
+                if literal in text:
+                    return
+        self.stream.write(text)
 
     def flush(self):
         self.stream.flush()
@@ -12,10 +12,13 @@ from google.adk.events import Event
 from .. import config
 from .state_adapter import get_domi_state
 from .checkpoint_manager import CheckpointManager
+from .logger import get_logger
 
 
 from typing import Callable, Optional, Any
-from pydantic import Field
+from pydantic import Field, PrivateAttr
+
+logger = get_logger(__name__)
 
 
 class MicroCheckpointWrapper(BaseAgent):
@@ -23,13 +26,11 @@ class MicroCheckpointWrapper(BaseAgent):
     A wrapper that adds micro-checkpointing capabilities to any agent.
     """
     agent_factory: Optional[Callable[[], BaseAgent]] = Field(default=None, exclude=True)
-    _agent: Optional[BaseAgent] = None
+    # Built from agent_factory on first run; a private attribute, so not a model field
+    _agent: Optional[BaseAgent] = PrivateAttr(default=None)
     
     def __init__(self, agent_factory: Callable[[], BaseAgent], **kwargs):
-        super().__init__(**kwargs)
-        # Use object.__setattr__ to bypass Pydantic validation
-        object.__setattr__(self, 'agent_factory', agent_factory)
-        object.__setattr__(self, '_agent', None)
+        super().__init__(agent_factory=agent_factory, **kwargs)
 
     async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
         """
@@ -40,22 +41,21 @@ class MicroCheckpointWrapper(BaseAgent):
         checkpoint_manager = CheckpointManager(task_id)
 
         # Always initialize the agent if not already done
-        if getattr(self, '_agent', None) is None:
-            agent = self.agent_factory()
-            object.__setattr__(self, '_agent', agent)
+        if self._agent is None:
+            self._agent = self.agent_factory()
 
-        agent = getattr(self, '_agent', None)
+        agent = self._agent
         if agent is None:
             raise RuntimeError("Failed to initialize agent")
             
         if not config.ENABLE_MICRO_CHECKPOINTS:
-            print(f"[{self.name}]: Micro-checkpoints disabled, running standard execution.")
+            logger.debug("[%s]: Micro-checkpoints disabled, running standard execution.", self.name)
             async for event in agent.run_async(ctx):
                 yield event
             return
 
         # Micro-checkpointing enabled - run with checkpointing logic
-        print(f"[{self.name}]: Micro-checkpoints enabled, running with checkpoint support.")
+        logger.debug("[%s]: Micro-checkpoints enabled, running with checkpoint support.", self.name)
         
         # For now, just run the agent normally until full micro-checkpoint logic is implemented
         # TODO: Implement full micro-checkpoint logic with operation tracking
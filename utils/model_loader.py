@@ -1,5 +1,6 @@
 # /department_of_market_intelligence/utils/model_loader.py
 import os
+from functools import lru_cache
 from google.adk.models.lite_llm import LiteLlm  # Use ADK's built-in class
 from .. import config
 
@@ -7,30 +8,39 @@ def get_llm_model(model_name: str):
     """
     Returns an ADK LiteLlm instance configured for your custom endpoint.
     This uses the standard ADK wrapper which correctly handles streaming.
+
+    Instances are shared: agents asking for the same model against the same endpoint
+    and key get one LiteLlm, so its setup and HTTP connection pool are reused.
     """
+    return _build_llm_model(model_name, config.CUSTOM_GEMINI_API_ENDPOINT, config.CUSTOM_API_KEY)
+
+
+# Keyed on the endpoint and key as well, so changes to config still take effect
+@lru_cache(maxsize=32)
+def _build_llm_model(model_name: str, api_endpoint: str, api_key: str) -> LiteLlm:
     if config.VERBOSE_LOGGING:
-        print(f"INFO: Using custom endpoint: {config.CUSTOM_GEMINI_API_ENDPOINT}")
+        print(f"INFO: Using custom endpoint: {api_endpoint}")
         print(f"INFO: Using model: {model_name}")
 
-    api_base = config.CUSTOM_GEMINI_API_ENDPOINT
+    api_base = api_endpoint
     if not api_base.endswith("/v1"):
         api_base = f"{api_base.rstrip('/')}/v1"
 
     # Since we're using an OpenAI-compatible endpoint (gemini-balance),
     # we need to use the openai provider format and set environment variables
     os.environ["OPENAI_API_BASE"] = api_base
-    os.environ["OPENAI_API_KEY"] = config.CUSTOM_API_KEY
-    
+    os.environ["OPENAI_API_KEY"] = api_key
+
     # Use openai provider for OpenAI-compatible endpoints
     model_string = f"openai/{model_name}"
 
     return LiteLlm(
         model=model_string,
-        api_key=config.CUSTOM_API_KEY,
+        api_key=api_key,
         api_base=api_base,
         # Let the ADK Runner handle the stream=True parameter when needed.
         # Set other defaults for reliability.
         timeout=600,
         max_tokens=8192,
         num_retries=3,  # Increased to retry on transient failures
-    )
\ No newline at end of file
+    )
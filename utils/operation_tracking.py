@@ -112,9 +112,9 @@ def tracked_operation(operation_id: str,
         # Operation completed or failed
         progress = checkpoint_manager.operation_registry.get(actual_operation_id)
         if progress:
-            logger.info(f"🏁 Operation {operation_id} finished:")
-            logger.info(f"   ✅ Completed: {len(progress.completed_steps)}/{progress.total_steps}")
-            logger.info(f"   ❌ Failed: {len(progress.failed_steps)}")
+            logger.info("🏁 Operation %s finished:", operation_id)
+            logger.info("   ✅ Completed: %s/%s", len(progress.completed_steps), progress.total_steps)
+            logger.info("   ❌ Failed: %s", len(progress.failed_steps))
 
 
 class OperationBuilder:
@@ -245,9 +245,9 @@ def resume_failed_operations(task_id: str = None) -> List[str]:
         
         if progress:
             resumed_ops.append(operation_id)
-            logger.info(f"🔄 Resumed operation: {operation_id}")
+            logger.info("🔄 Resumed operation: %s", operation_id)
         else:
-            logger.error(f"❌ Failed to resume operation: {operation_id}")
+            logger.error("❌ Failed to resume operation: %s", operation_id)
     
     return resumed_ops
 
@@ -289,9 +289,9 @@ def print_recovery_status(task_id: str = None):
     """Print recovery status for human review."""
     report = get_operation_recovery_report(task_id)
     
-    logger.info(f"\n🔍 OPERATION RECOVERY STATUS")
-    logger.info(f"Task ID: {report['task_id']}")
-    logger.info(f"Recoverable Operations: {report['total_recoverable_operations']}")
+    logger.info("\n🔍 OPERATION RECOVERY STATUS")
+    logger.info("Task ID: %s", report['task_id'])
+    logger.info("Recoverable Operations: %s", report['total_recoverable_operations'])
     logger.info("=" * 50)
     
     if not report["operations"]:
@@ -299,15 +299,15 @@ def print_recovery_status(task_id: str = None):
         return
     
     for op in report["operations"]:
-        logger.info(f"\n📋 Operation: {op['operation_id']}")
-        logger.info(f"   Agent: {op['agent_name']}")
-        logger.info(f"   Progress: {op['progress']}")
-        logger.info(f"   Failed Steps: {op['failed_steps']}")
-        logger.info(f"   Created: {op['created_at']}")
+        logger.info("\n📋 Operation: %s", op['operation_id'])
+        logger.info("   Agent: %s", op['agent_name'])
+        logger.info("   Progress: %s", op['progress'])
+        logger.info("   Failed Steps: %s", op['failed_steps'])
+        logger.info("   Created: %s", op['created_at'])
         if op['current_step']:
-            logger.info(f"   Current Step: {op['current_step']}")
+            logger.info("   Current Step: %s", op['current_step'])
     
     if report["recovery_recommendations"]:
-        logger.info(f"\n🛠️  RECOVERY RECOMMENDATIONS:")
+        logger.info("\n🛠️  RECOVERY RECOMMENDATIONS:")
         for rec in report["recovery_recommendations"]:
-            logger.info(f"   • {rec['operation_id']}: {rec['issue']} → {rec['action']}")
\ No newline at end of file
+            logger.info("   • %s: %s → %s", rec['operation_id'], rec['issue'], rec['action'])
\ No newline at end of file
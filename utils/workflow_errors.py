@@ -56,6 +56,15 @@ ERROR_PATTERNS = [
     (r"WORKFLOW_WARNING:\s*(.+)", WorkflowErrorLevel.WARNING),
 ]
 
+_COMPILED_ERROR_PATTERNS = [
+    (re.compile(pattern, re.MULTILINE | re.IGNORECASE), level)
+    for pattern, level in ERROR_PATTERNS
+]
+
+# Every critical/fatal pattern above requires one of these markers, so a single
+# pass with this regex rules out the common no-error case.
+_CRITICAL_MARKER_RE = re.compile(r"(?:CRITICAL|FATAL)_WORKFLOW_ERROR:", re.IGNORECASE)
+
 
 def detect_workflow_errors(text: str, agent_name: str = None) -> List[Tuple[WorkflowErrorLevel, str]]:
     """
@@ -70,9 +79,8 @@ def detect_workflow_errors(text: str, agent_name: str = None) -> List[Tuple[Work
     """
     errors = []
     
-    for pattern, level in ERROR_PATTERNS:
-        matches = re.finditer(pattern, text, re.MULTILINE | re.IGNORECASE)
-        for match in matches:
+    for pattern, level in _COMPILED_ERROR_PATTERNS:
+        for match in pattern.finditer(text):
             error_message = match.group(1).strip()
             errors.append((level, error_message))
     
@@ -96,6 +104,9 @@ def check_for_critical_errors(text: str, agent_name: str = None,
     Raises:
         WorkflowError: If critical error found and stop_on_critical is True
     """
+    if not _CRITICAL_MARKER_RE.search(text):
+        return None
+
     errors = detect_workflow_errors(text, agent_name)
     
     # Find the most severe error